@@ -27,8 +27,8 @@ setuptools.setup(
         "isi-sdk-8-2-0 ~= 0.2.11",
         "isi-sdk-8-2-1 ~= 0.2.11",
         "isi-sdk-8-2-2 ~= 0.2.11",
+        'importlib-metadata >= 1.0.0; python_version < "3.8"',
         "requests >= 2.20.0",
-        "setuptools >= 41.0.0",
         "urllib3 >= 1.22.0",
     ],
     entry_points={
@@ -1,7 +1,10 @@
 """Isilon Hadoop Tools"""
 
 
-from pkg_resources import get_distribution
+try:
+    from importlib.metadata import PackageNotFoundError, version
+except ImportError:  # Python 3.7
+    from importlib_metadata import PackageNotFoundError, version
 
 
 __all__ = [
@@ -10,7 +13,10 @@ __all__ = [
     # Exceptions
     "IsilonHadoopToolError",
 ]
-__version__ = get_distribution(__name__).version
+try:
+    __version__ = version(__name__)
+except PackageNotFoundError:
+    __version__ = "0.0.0"
 
 
 class IsilonHadoopToolError(Exception):
@@ -5,8 +5,6 @@ import os
 import sys
 import time
 
-import urllib3
-
 import isilon_hadoop_tools
 import isilon_hadoop_tools.cli
 import isilon_hadoop_tools.directories
@@ -49,6 +47,8 @@ def base_cli(parser=None):
 def configure_script(args):
     """Logic that applies to all scripts goes here."""
     if args.no_verify:
+        import urllib3  # pylint: disable=import-outside-toplevel
+
         urllib3.disable_warnings()
 
 
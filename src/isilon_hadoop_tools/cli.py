@@ -1,10 +1,9 @@
 """This module defines a CLI common to all command-line tools."""
 
 import argparse
-import getpass
 import logging
 
-import isilon_hadoop_tools.onefs
+import isilon_hadoop_tools
 
 
 __all__ = [
@@ -110,14 +109,25 @@ class HintedError(CLIError):
         return str(getattr(self, "__cause__", None)) + "\nHint: " + base_str
 
 
-def _client_from_onefs_cli(init, args):
+def _client_from_onefs_cli(args, for_hdfs=False):
+    # The onefs module (and requests/urllib3 with it) is only needed once a connection is made,
+    # so it is not imported until then to keep --help and --version fast.
+    # pylint: disable=import-outside-toplevel,redefined-outer-name
+    import isilon_hadoop_tools.onefs
+
+    # Prompt for the password only once everything else has been parsed and imported.
+    password = args.onefs_password
+    if password is None:
+        import getpass
+
+        password = getpass.getpass()
+
+    client_cls = isilon_hadoop_tools.onefs.Client
     try:
-        return init(
+        return (client_cls.for_hdfs if for_hdfs else client_cls)(
             address=args.onefs_address,
             username=args.onefs_user,
-            password=getpass.getpass()
-            if args.onefs_password is None
-            else args.onefs_password,
+            password=password,
             default_zone=args.zone,
             verify_ssl=not args.no_verify,
         )
@@ -141,12 +151,12 @@ def _client_from_onefs_cli(init, args):
 
 def hdfs_client(args):
     """Get a onefs.Client.for_hdfs from args parsed by onefs_cli."""
-    return _client_from_onefs_cli(isilon_hadoop_tools.onefs.Client.for_hdfs, args)
+    return _client_from_onefs_cli(args, for_hdfs=True)
 
 
 def onefs_client(args):
     """Get a onefs.Client from args parsed by onefs_cli."""
-    return _client_from_onefs_cli(isilon_hadoop_tools.onefs.Client, args)
+    return _client_from_onefs_cli(args)
 
 
 def logging_cli(parser=None):
@@ -3,7 +3,6 @@
 import logging
 import posixpath
 
-import isilon_hadoop_tools.onefs
 from isilon_hadoop_tools import IsilonHadoopToolError
 
 __all__ = [
@@ -22,6 +21,10 @@ __all__ = [
 LOGGER = logging.getLogger(__name__)
 
 
+def _pass(*_, **__):
+    pass
+
+
 class DirectoriesError(IsilonHadoopToolError):
     """All exceptions emitted from this module inherit from this Exception."""
 
@@ -38,10 +41,12 @@ class Creator:
         self.onefs = onefs
         self.onefs_zone = onefs_zone
 
-    def create_directories(
+    def create_directories(  # pylint: disable=too-many-locals
         self, directories, setup=None, mkdir=None, chmod=None, chown=None
     ):
         """Create directories on HDFS on OneFS."""
+        import isilon_hadoop_tools.onefs  # pylint: disable=import-outside-toplevel
+
         if self.onefs_zone.lower() == "system":
             LOGGER.warning("Deploying in the System zone is not recommended.")
         sep = posixpath.sep
@@ -59,18 +64,24 @@ class Creator:
         zone_hdfs = hdfs_root[len(zone_root) :]
         if setup:
             setup(zone_root, hdfs_root, zone_hdfs)
+        # Unless the caller overrides chmod or chown, the mode and ownership
+        # are set with a single call instead of one call each.
+        combine_chmod_chown = chmod is None and chown is None
+        mkdir = mkdir or self.onefs.mkdir
+        chmod = chmod or self.onefs.chmod
+        chown = chown or self.onefs.chown
+        zone = self.onefs_zone
         for directory in directories:
-            path = posixpath.join(zone_hdfs, directory.path.lstrip(posixpath.sep))
+            path = posixpath.join(zone_hdfs, directory.path.lstrip(sep))
             LOGGER.info("mkdir '%s%s'", zone_root, path)
             try:
-                (mkdir or self.onefs.mkdir)(path, directory.mode, zone=self.onefs_zone)
+                mkdir(path, directory.mode, zone=zone)
             except isilon_hadoop_tools.onefs.APIError as exc:
                 if exc.dir_path_already_exists_error():
                     LOGGER.warning("%s%s already exists. ", zone_root, path)
                 else:
                     raise
             LOGGER.info("chmod '%o' '%s%s'", directory.mode, zone_root, path)
-            (chmod or self.onefs.chmod)(path, directory.mode, zone=self.onefs_zone)
             LOGGER.info(
                 "chown '%s:%s' '%s%s'",
                 directory.owner,
@@ -78,19 +89,25 @@ class Creator:
                 zone_root,
                 path,
             )
-            (chown or self.onefs.chown)(
-                path,
-                owner=directory.owner,
-                group=directory.group,
-                zone=self.onefs_zone,
-            )
+            if combine_chmod_chown:
+                chown(
+                    path,
+                    owner=directory.owner,
+                    group=directory.group,
+                    zone=zone,
+                    mode=directory.mode,
+                )
+            else:
+                chmod(path, directory.mode, zone=zone)
+                chown(
+                    path,
+                    owner=directory.owner,
+                    group=directory.group,
+                    zone=zone,
+                )
 
     def log_directories(self, directories):
         """Log the actions that would be taken by create_directories."""
-
-        def _pass(*_, **__):
-            pass
-
         self.create_directories(
             directories, setup=_pass, mkdir=_pass, chmod=_pass, chown=_pass
         )
@@ -100,6 +117,8 @@ class HDFSDirectory:  # pylint: disable=too-few-public-methods
 
     """A Directory on HDFS"""
 
+    __slots__ = ("path", "owner", "group", "mode")
+
     def __init__(self, path, owner, group, mode):
         self.path = path
         self.owner = owner
@@ -112,129 +131,130 @@ class HDFSDirectory:  # pylint: disable=too-few-public-methods
         self.group += suffix
 
 
+def _with_identity_suffix(directories, identity_suffix):
+    suffix = identity_suffix or ""
+    return [
+        HDFSDirectory(path, owner + suffix, group + suffix, mode)
+        for path, owner, group, mode in directories
+    ]
+
+
+_CDH_DIRECTORIES = (
+    ("/", "hdfs", "hadoop", 0o755),
+    ("/hbase", "hbase", "hbase", 0o755),
+    ("/solr", "solr", "solr", 0o775),
+    ("/tmp", "hdfs", "supergroup", 0o1777),
+    ("/tmp/hive", "hive", "supergroup", 0o777),
+    ("/tmp/logs", "mapred", "hadoop", 0o1777),
+    ("/user", "hdfs", "supergroup", 0o755),
+    ("/user/flume", "flume", "flume", 0o775),
+    ("/user/hdfs", "hdfs", "hdfs", 0o755),
+    ("/user/history", "mapred", "hadoop", 0o777),
+    ("/user/hive", "hive", "hive", 0o775),
+    ("/user/hive/warehouse", "hive", "hive", 0o1777),
+    ("/user/hue", "hue", "hue", 0o755),
+    ("/user/hue/.cloudera_manager_hive_metastore_canary", "hue", "hue", 0o777),
+    ("/user/impala", "impala", "impala", 0o775),
+    ("/user/oozie", "oozie", "oozie", 0o775),
+    ("/user/spark", "spark", "spark", 0o751),
+    ("/user/spark/applicationHistory", "spark", "spark", 0o1777),
+    ("/user/sqoop2", "sqoop2", "sqoop", 0o775),
+    ("/user/yarn", "yarn", "yarn", 0o755),
+)
+
+
 def cdh_directories(identity_suffix=None):
     """Directories needed for Cloudera Distribution including Hadoop"""
-    directories = [
-        HDFSDirectory("/", "hdfs", "hadoop", 0o755),
-        HDFSDirectory("/hbase", "hbase", "hbase", 0o755),
-        HDFSDirectory("/solr", "solr", "solr", 0o775),
-        HDFSDirectory("/tmp", "hdfs", "supergroup", 0o1777),
-        HDFSDirectory("/tmp/hive", "hive", "supergroup", 0o777),
-        HDFSDirectory("/tmp/logs", "mapred", "hadoop", 0o1777),
-        HDFSDirectory("/user", "hdfs", "supergroup", 0o755),
-        HDFSDirectory("/user/flume", "flume", "flume", 0o775),
-        HDFSDirectory("/user/hdfs", "hdfs", "hdfs", 0o755),
-        HDFSDirectory("/user/history", "mapred", "hadoop", 0o777),
-        HDFSDirectory("/user/hive", "hive", "hive", 0o775),
-        HDFSDirectory("/user/hive/warehouse", "hive", "hive", 0o1777),
-        HDFSDirectory("/user/hue", "hue", "hue", 0o755),
-        HDFSDirectory(
-            "/user/hue/.cloudera_manager_hive_metastore_canary", "hue", "hue", 0o777
-        ),
-        HDFSDirectory("/user/impala", "impala", "impala", 0o775),
-        HDFSDirectory("/user/oozie", "oozie", "oozie", 0o775),
-        HDFSDirectory("/user/spark", "spark", "spark", 0o751),
-        HDFSDirectory("/user/spark/applicationHistory", "spark", "spark", 0o1777),
-        HDFSDirectory("/user/sqoop2", "sqoop2", "sqoop", 0o775),
-        HDFSDirectory("/user/yarn", "yarn", "yarn", 0o755),
-    ]
-    if identity_suffix:
-        for directory in directories:
-            directory.apply_identity_suffix(identity_suffix)
-    return directories
+    return _with_identity_suffix(_CDH_DIRECTORIES, identity_suffix)
+
+
+_CDP_DIRECTORIES = (
+    ("/", "hdfs", "hadoop", 0o755),
+    ("/hbase", "hbase", "hbase", 0o755),
+    ("/ranger", "hdfs", "supergroup", 0o755),
+    ("/ranger/audit", "hdfs", "supergroup", 0o755),
+    ("/solr", "solr", "solr", 0o775),
+    ("/tmp", "hdfs", "supergroup", 0o1777),
+    ("/tmp/hive", "hive", "supergroup", 0o777),
+    ("/tmp/logs", "yarn", "hadoop", 0o1777),
+    ("/user", "hdfs", "supergroup", 0o755),
+    ("/user/flume", "flume", "flume", 0o775),
+    ("/user/hdfs", "hdfs", "hdfs", 0o755),
+    ("/user/history", "mapred", "hadoop", 0o777),
+    ("/user/history/done_intermediate", "mapred", "hadoop", 0o1777),
+    ("/user/hive", "hive", "hive", 0o775),
+    ("/user/hive/warehouse", "hive", "hive", 0o1777),
+    ("/user/hue", "hue", "hue", 0o755),
+    ("/user/hue/.cloudera_manager_hive_metastore_canary", "hue", "hue", 0o777),
+    ("/user/impala", "impala", "impala", 0o775),
+    ("/user/livy", "livy", "livy", 0o775),
+    ("/user/oozie", "oozie", "oozie", 0o775),
+    ("/user/spark", "spark", "spark", 0o751),
+    ("/user/spark/applicationHistory", "spark", "spark", 0o1777),
+    ("/user/spark/spark3ApplicationHistory", "spark", "spark", 0o1777),
+    ("/user/spark/driverLogs", "spark", "spark", 0o1777),
+    ("/user/spark/driver3Logs", "spark", "spark", 0o1777),
+    ("/user/sqoop", "sqoop", "sqoop", 0o775),
+    ("/user/sqoop2", "sqoop2", "sqoop", 0o775),
+    ("/user/tez", "hdfs", "supergroup", 0o775),
+    ("/user/yarn", "hdfs", "supergroup", 0o775),
+    ("/user/yarn/mapreduce", "hdfs", "supergroup", 0o775),
+    ("/user/yarn/mapreduce/mr-framework", "yarn", "hadoop", 0o775),
+    ("/user/yarn/services", "hdfs", "supergroup", 0o775),
+    ("/user/yarn/services/service-framework", "hdfs", "supergroup", 0o775),
+    ("/user/zeppelin", "zeppelin", "zeppelin", 0o775),
+    ("/warehouse", "hdfs", "supergroup", 0o775),
+    ("/warehouse/tablespace", "hdfs", "supergroup", 0o775),
+    ("/warehouse/tablespace/external", "hdfs", "supergroup", 0o775),
+    ("/warehouse/tablespace/managed", "hdfs", "supergroup", 0o775),
+    ("/warehouse/tablespace/external/hive", "hive", "hive", 0o1775),
+    ("/warehouse/tablespace/managed/hive", "hive", "hive", 0o1775),
+    ("/yarn", "yarn", "yarn", 0o700),
+    ("/yarn/node-labels", "yarn", "yarn", 0o700),
+)
 
 
 def cdp_directories(identity_suffix=None):
     """Directories needed for Cloudera Data Platform"""
-    directories = [
-        HDFSDirectory("/", "hdfs", "hadoop", 0o755),
-        HDFSDirectory("/hbase", "hbase", "hbase", 0o755),
-        HDFSDirectory("/ranger", "hdfs", "supergroup", 0o755),
-        HDFSDirectory("/ranger/audit", "hdfs", "supergroup", 0o755),
-        HDFSDirectory("/solr", "solr", "solr", 0o775),
-        HDFSDirectory("/tmp", "hdfs", "supergroup", 0o1777),
-        HDFSDirectory("/tmp/hive", "hive", "supergroup", 0o777),
-        HDFSDirectory("/tmp/logs", "yarn", "hadoop", 0o1777),
-        HDFSDirectory("/user", "hdfs", "supergroup", 0o755),
-        HDFSDirectory("/user/flume", "flume", "flume", 0o775),
-        HDFSDirectory("/user/hdfs", "hdfs", "hdfs", 0o755),
-        HDFSDirectory("/user/history", "mapred", "hadoop", 0o777),
-        HDFSDirectory("/user/history/done_intermediate", "mapred", "hadoop", 0o1777),
-        HDFSDirectory("/user/hive", "hive", "hive", 0o775),
-        HDFSDirectory("/user/hive/warehouse", "hive", "hive", 0o1777),
-        HDFSDirectory("/user/hue", "hue", "hue", 0o755),
-        HDFSDirectory(
-            "/user/hue/.cloudera_manager_hive_metastore_canary", "hue", "hue", 0o777
-        ),
-        HDFSDirectory("/user/impala", "impala", "impala", 0o775),
-        HDFSDirectory("/user/livy", "livy", "livy", 0o775),
-        HDFSDirectory("/user/oozie", "oozie", "oozie", 0o775),
-        HDFSDirectory("/user/spark", "spark", "spark", 0o751),
-        HDFSDirectory("/user/spark/applicationHistory", "spark", "spark", 0o1777),
-        HDFSDirectory("/user/spark/spark3ApplicationHistory", "spark", "spark", 0o1777),
-        HDFSDirectory("/user/spark/driverLogs", "spark", "spark", 0o1777),
-        HDFSDirectory("/user/spark/driver3Logs", "spark", "spark", 0o1777),
-        HDFSDirectory("/user/sqoop", "sqoop", "sqoop", 0o775),
-        HDFSDirectory("/user/sqoop2", "sqoop2", "sqoop", 0o775),
-        HDFSDirectory("/user/tez", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/user/yarn", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/user/yarn/mapreduce", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/user/yarn/mapreduce/mr-framework", "yarn", "hadoop", 0o775),
-        HDFSDirectory("/user/yarn/services", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/user/yarn/services/service-framework", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/user/zeppelin", "zeppelin", "zeppelin", 0o775),
-        HDFSDirectory("/warehouse", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/warehouse/tablespace", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/warehouse/tablespace/external", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/warehouse/tablespace/managed", "hdfs", "supergroup", 0o775),
-        HDFSDirectory("/warehouse/tablespace/external/hive", "hive", "hive", 0o1775),
-        HDFSDirectory("/warehouse/tablespace/managed/hive", "hive", "hive", 0o1775),
-        HDFSDirectory("/yarn", "yarn", "yarn", 0o700),
-        HDFSDirectory("/yarn/node-labels", "yarn", "yarn", 0o700),
-    ]
-    if identity_suffix:
-        for directory in directories:
-            directory.apply_identity_suffix(identity_suffix)
-    return directories
+    return _with_identity_suffix(_CDP_DIRECTORIES, identity_suffix)
+
+
+_HDP_DIRECTORIES = (
+    ("/", "hdfs", "hadoop", 0o755),
+    ("/app-logs", "yarn", "hadoop", 0o1777),
+    ("/app-logs/ambari-qa", "ambari-qa", "hadoop", 0o770),
+    ("/app-logs/ambari-qa/logs", "ambari-qa", "hadoop", 0o770),
+    ("/apps", "hdfs", "hadoop", 0o755),
+    ("/apps/accumulo", "accumulo", "hadoop", 0o750),
+    ("/apps/falcon", "falcon", "hdfs", 0o777),
+    ("/apps/hbase", "hdfs", "hadoop", 0o755),
+    ("/apps/hbase/data", "hbase", "hadoop", 0o775),
+    ("/apps/hbase/staging", "hbase", "hadoop", 0o711),
+    ("/apps/hive", "hdfs", "hdfs", 0o755),
+    ("/apps/hive/warehouse", "hive", "hdfs", 0o777),
+    ("/apps/tez", "tez", "hdfs", 0o755),
+    ("/apps/webhcat", "hcat", "hdfs", 0o755),
+    ("/ats", "yarn", "hdfs", 0o755),
+    ("/ats/done", "yarn", "hdfs", 0o775),
+    ("/atsv2", "yarn-ats", "hadoop", 0o755),
+    ("/mapred", "mapred", "hadoop", 0o755),
+    ("/mapred/system", "mapred", "hadoop", 0o755),
+    ("/system", "yarn", "hadoop", 0o755),
+    ("/system/yarn", "yarn", "hadoop", 0o755),
+    ("/system/yarn/node-labels", "yarn", "hadoop", 0o700),
+    ("/tmp", "hdfs", "hdfs", 0o1777),
+    ("/tmp/hive", "ambari-qa", "hdfs", 0o777),
+    ("/user", "hdfs", "hdfs", 0o755),
+    ("/user/ambari-qa", "ambari-qa", "hdfs", 0o770),
+    ("/user/hcat", "hcat", "hdfs", 0o755),
+    ("/user/hdfs", "hdfs", "hdfs", 0o755),
+    ("/user/hive", "hive", "hdfs", 0o700),
+    ("/user/hue", "hue", "hue", 0o755),
+    ("/user/oozie", "oozie", "hdfs", 0o775),
+    ("/user/yarn", "yarn", "hdfs", 0o755),
+)
 
 
 def hdp_directories(identity_suffix=None):
     """Directories needed for Hortonworks Data Platform"""
-    directories = [
-        HDFSDirectory("/", "hdfs", "hadoop", 0o755),
-        HDFSDirectory("/app-logs", "yarn", "hadoop", 0o1777),
-        HDFSDirectory("/app-logs/ambari-qa", "ambari-qa", "hadoop", 0o770),
-        HDFSDirectory("/app-logs/ambari-qa/logs", "ambari-qa", "hadoop", 0o770),
-        HDFSDirectory("/apps", "hdfs", "hadoop", 0o755),
-        HDFSDirectory("/apps/accumulo", "accumulo", "hadoop", 0o750),
-        HDFSDirectory("/apps/falcon", "falcon", "hdfs", 0o777),
-        HDFSDirectory("/apps/hbase", "hdfs", "hadoop", 0o755),
-        HDFSDirectory("/apps/hbase/data", "hbase", "hadoop", 0o775),
-        HDFSDirectory("/apps/hbase/staging", "hbase", "hadoop", 0o711),
-        HDFSDirectory("/apps/hive", "hdfs", "hdfs", 0o755),
-        HDFSDirectory("/apps/hive/warehouse", "hive", "hdfs", 0o777),
-        HDFSDirectory("/apps/tez", "tez", "hdfs", 0o755),
-        HDFSDirectory("/apps/webhcat", "hcat", "hdfs", 0o755),
-        HDFSDirectory("/ats", "yarn", "hdfs", 0o755),
-        HDFSDirectory("/ats/done", "yarn", "hdfs", 0o775),
-        HDFSDirectory("/atsv2", "yarn-ats", "hadoop", 0o755),
-        HDFSDirectory("/mapred", "mapred", "hadoop", 0o755),
-        HDFSDirectory("/mapred/system", "mapred", "hadoop", 0o755),
-        HDFSDirectory("/system", "yarn", "hadoop", 0o755),
-        HDFSDirectory("/system/yarn", "yarn", "hadoop", 0o755),
-        HDFSDirectory("/system/yarn/node-labels", "yarn", "hadoop", 0o700),
-        HDFSDirectory("/tmp", "hdfs", "hdfs", 0o1777),
-        HDFSDirectory("/tmp/hive", "ambari-qa", "hdfs", 0o777),
-        HDFSDirectory("/user", "hdfs", "hdfs", 0o755),
-        HDFSDirectory("/user/ambari-qa", "ambari-qa", "hdfs", 0o770),
-        HDFSDirectory("/user/hcat", "hcat", "hdfs", 0o755),
-        HDFSDirectory("/user/hdfs", "hdfs", "hdfs", 0o755),
-        HDFSDirectory("/user/hive", "hive", "hdfs", 0o700),
-        HDFSDirectory("/user/hue", "hue", "hue", 0o755),
-        HDFSDirectory("/user/oozie", "oozie", "hdfs", 0o775),
-        HDFSDirectory("/user/yarn", "yarn", "hdfs", 0o755),
-    ]
-    if identity_suffix:
-        for directory in directories:
-            directory.apply_identity_suffix(identity_suffix)
-    return directories
+    return _with_identity_suffix(_HDP_DIRECTORIES, identity_suffix)
@@ -1,10 +1,9 @@
 """Define and create necessary Hadoop users and groups on OneFS."""
 
+import contextlib
 import logging
 import os
 
-import isilon_hadoop_tools.onefs
-
 
 __all__ = [
     # Functions
@@ -34,17 +33,31 @@ def _log_add_user_to_group(user_name, group_name):
     LOGGER.info("Add %s user to %s group.", user_name, group_name)
 
 
+class _FormattedMembers:  # pylint: disable=too-few-public-methods
+
+    """Format proxy user members only if a log record is actually emitted."""
+
+    __slots__ = ("members",)
+
+    def __init__(self, members):
+        self.members = members
+
+    def __str__(self):
+        return ", ".join(
+            f"{member_name} ({member_type})"
+            for member_name, member_type in self.members
+        )
+
+
 def _log_create_proxy_user(proxy_user_name, members):
     LOGGER.info(
         "Create %s proxy user with the following members: %s.",
         proxy_user_name,
-        ", ".join(
-            f"{member_name} ({member_type})" for member_name, member_type in members
-        ),
+        _FormattedMembers(members),
     )
 
 
-class Creator:
+class Creator:  # pylint: disable=too-many-instance-attributes
 
     """
     Create users and groups with contiguous IDs on OneFS
@@ -71,25 +84,33 @@ class Creator:
         self._next_gid = start_gid
         self.script_path = script_path
         self.user_password = user_password
+        self._script_created = False
+        self._script_lines = None
 
     @property
     def next_gid(self):
         """Get the next monotonically-increasing GID (begins at start_gid)."""
-        try:
-            return self._next_gid
-        finally:
-            self._next_gid += 1
+        return self._alloc_gid()
 
     @property
     def next_uid(self):
         """Get the next monotonically-increasing UID (begins at start_uid)."""
-        try:
-            return self._next_uid
-        finally:
-            self._next_uid += 1
+        return self._alloc_uid()
+
+    def _alloc_gid(self):
+        gid = self._next_gid
+        self._next_gid += 1
+        return gid
+
+    def _alloc_uid(self):
+        uid = self._next_uid
+        self._next_uid += 1
+        return uid
 
     def add_user_to_group(self, user_name, group_name):
         """Add a user to a group on OneFS and in the local group-creation script."""
+        import isilon_hadoop_tools.onefs  # pylint: disable=import-outside-toplevel
+
         try:
             LOGGER.info(
                 "Adding the %s user to the %s group on %s...",
@@ -118,14 +139,15 @@ class Creator:
                 group_name,
                 self.script_path,
             )
-            with open(self.script_path, "a", encoding=ENCODING) as script_file:
-                script_file.write(f"usermod -a -G {group_name} {user_name}\n")
+            self._append_to_script(f"usermod -a -G {group_name} {user_name}\n")
 
     def create_group(self, group_name):
         """Create a group on OneFS and in the local script."""
+        import isilon_hadoop_tools.onefs  # pylint: disable=import-outside-toplevel
+
         while True:
             try:
-                gid = self.next_gid
+                gid = self._alloc_gid()
                 LOGGER.info(
                     "Creating the %s group with GID %s on %s...",
                     group_name,
@@ -155,8 +177,7 @@ class Creator:
                 gid,
                 self.script_path,
             )
-            with open(self.script_path, "a", encoding=ENCODING) as script_file:
-                script_file.write(f"groupadd --gid {gid} {group_name}\n")
+            self._append_to_script(f"groupadd --gid {gid} {group_name}\n")
         return gid
 
     def create_identities(
@@ -175,13 +196,14 @@ class Creator:
         if self.script_path:
             LOGGER.info("Creating %s...", self.script_path)
             (_create_script or self._create_script)()
-        iterate_identities(
-            identities,
-            create_group=create_group or self.create_group,
-            create_user=create_user or self.create_user,
-            add_user_to_group=add_user_to_group or self.add_user_to_group,
-            create_proxy_user=create_proxy_user or self.create_proxy_user,
-        )
+        with self._buffered_script():
+            iterate_identities(
+                identities,
+                create_group=create_group or self.create_group,
+                create_user=create_user or self.create_user,
+                add_user_to_group=add_user_to_group or self.add_user_to_group,
+                create_proxy_user=create_proxy_user or self.create_proxy_user,
+            )
         LOGGER.info("Flushing the auth cache...")
         (_flush_auth_cache or self.onefs.flush_auth_cache)()
 
@@ -199,14 +221,13 @@ class Creator:
 
     def create_proxy_user(self, proxy_user_name, members):
         """Create a proxy user on OneFS."""
+        import isilon_hadoop_tools.onefs  # pylint: disable=import-outside-toplevel
+
         try:
             LOGGER.info(
                 "Creating the %s proxy user with the following members: %s...",
                 proxy_user_name,
-                ", ".join(
-                    f"{member_name} ({member_type})"
-                    for member_name, member_type in members
-                ),
+                _FormattedMembers(members),
             )
             self.onefs.create_hdfs_proxy_user(
                 name=proxy_user_name,
@@ -221,18 +242,44 @@ class Creator:
                 return
             raise
 
+    def _append_to_script(self, line):
+        if self._script_lines is not None:
+            self._script_lines.append(line)
+            return
+        with open(self.script_path, "a", encoding=ENCODING) as script_file:
+            script_file.write(line)
+
+    @contextlib.contextmanager
+    def _buffered_script(self):
+        """Collect script lines in memory and write them with a single open()."""
+        self._script_lines = []
+        try:
+            yield
+        finally:
+            # Write whatever was collected, even on failure,
+            # so the script still reflects the identities that were created on OneFS.
+            lines, self._script_lines = self._script_lines, None
+            if lines:
+                with open(self.script_path, "a", encoding=ENCODING) as script_file:
+                    script_file.writelines(lines)
+
     def _create_script(self):
+        if self._script_created:
+            return
         if not os.path.exists(self.script_path):
             with open(self.script_path, "w", encoding=ENCODING) as script_file:
                 script_file.write("#!/usr/bin/env sh\n")
                 script_file.write("set -o errexit\n")
                 script_file.write("set -o xtrace\n")
+        self._script_created = True
 
     def create_user(self, user_name, primary_group_name):
         """Create a user on OneFS and in the local script."""
+        import isilon_hadoop_tools.onefs  # pylint: disable=import-outside-toplevel
+
         while True:
             try:
-                uid = self.next_uid
+                uid = self._alloc_uid()
                 LOGGER.info(
                     "Creating the %s user with UID %s on %s...",
                     user_name,
@@ -247,6 +294,7 @@ class Creator:
                     enabled=True,
                     password=self.user_password,
                 )
+                created = True
                 break
             except isilon_hadoop_tools.onefs.APIError as exc:
                 if exc.uid_already_exists_error(uid):
@@ -259,6 +307,7 @@ class Creator:
                     uid = self.onefs.uid_of_user(
                         user_name=user_name, zone=self.onefs_zone
                     )
+                    created = False
                     break
                 raise
         if self.script_path:
@@ -269,15 +318,17 @@ class Creator:
                 uid,
                 self.script_path,
             )
-            gid = self.onefs.gid_of_group(
-                group_name=self.onefs.primary_group_of_user(
+            if not created:
+                # A preexisting user may have a different primary group than requested.
+                primary_group_name = self.onefs.primary_group_of_user(
                     user_name=user_name,
                     zone=self.onefs_zone,
-                ),
+                )
+            gid = self.onefs.gid_of_group(
+                group_name=primary_group_name,
                 zone=self.onefs_zone,
             )
-            with open(self.script_path, "a", encoding=ENCODING) as script_file:
-                script_file.write(f"useradd --uid {uid} --gid {gid} {user_name}\n")
+            self._append_to_script(f"useradd --uid {uid} --gid {gid} {user_name}\n")
         return uid
 
 
@@ -290,17 +341,15 @@ def iterate_identities(
 ):
     """Iterate over all groups, users, and proxy users in creation-order."""
 
-    created_group_names = set()
-    for group_name in identities["groups"]:
-        if group_name not in created_group_names:
-            create_group(group_name)
-            created_group_names.add(group_name)
+    # Every group, in the order it is first referenced (unlike a set, a dict keeps that order).
+    group_names = dict.fromkeys(identities["groups"])
+    for pgroup_name, sgroup_names in identities["users"].values():
+        group_names[pgroup_name] = None
+        group_names.update(dict.fromkeys(sgroup_names))
+    for group_name in group_names:
+        create_group(group_name)
 
     for user_name, (pgroup_name, sgroup_names) in identities["users"].items():
-        for group_name in sgroup_names.union({pgroup_name}):
-            if group_name not in created_group_names:
-                create_group(group_name)
-                created_group_names.add(group_name)
         create_user(user_name, pgroup_name)
         for group_name in sgroup_names:
             add_user_to_group(user_name, group_name)
@@ -326,20 +375,27 @@ def with_suffix_applied(
     applicator=lambda identity, suffix: identity + suffix,
 ):
     """Append a suffix to all identities."""
+    # The same names recur across groups, users, and proxy users,
+    # so apply the suffix to each distinct name only once.
+    names = {*identities["groups"], *identities["users"], *identities["proxy_users"]}
+    for pgroup_name, sgroup_names in identities["users"].values():
+        names.add(pgroup_name)
+        names.update(sgroup_names)
+    for members in identities["proxy_users"].values():
+        names.update(member_name for member_name, _ in members)
+    suffixed = {name: applicator(name, suffix) for name in names}
     return {
-        "groups": {
-            applicator(group_name, suffix) for group_name in identities["groups"]
-        },
+        "groups": {suffixed[group_name] for group_name in identities["groups"]},
         "users": {
-            applicator(user_name, suffix): (
-                applicator(pgroup_name, suffix),
-                {applicator(sgroup_name, suffix) for sgroup_name in sgroup_names},
+            suffixed[user_name]: (
+                suffixed[pgroup_name],
+                {suffixed[sgroup_name] for sgroup_name in sgroup_names},
             )
             for user_name, (pgroup_name, sgroup_names) in identities["users"].items()
         },
         "proxy_users": {
-            applicator(proxy_user_name, suffix): {
-                (applicator(member_name, suffix), member_type)
+            suffixed[proxy_user_name]: {
+                (suffixed[member_name], member_type)
                 for member_name, member_type in members
             }
             for proxy_user_name, members in identities["proxy_users"].items()
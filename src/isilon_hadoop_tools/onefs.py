@@ -2,11 +2,13 @@
 
 # pylint: disable=too-many-lines
 
-from datetime import date, datetime
+from datetime import date
 from enum import Enum
+import functools
 import json
 import logging
 import posixpath
+import random
 import socket
 import struct
 import time
@@ -63,6 +65,27 @@ ONEFS_RELEASES = {
     "8.2.3.0": 0x802035000000000,
 }
 REQUEST_TIMEOUT = 60 * 3  # seconds
+# Retries of temporarily unavailable PAPI calls back off exponentially, with jitter.
+RETRY_BASE_DELAY = 0.25  # seconds
+RETRY_MAX_DELAY = 8  # seconds
+RETRY_MAX_ATTEMPTS = 10
+
+
+# OneFS upgrade generations, as used by the OneFSFeature values below
+_GEN_INIT = 0x0000000
+_GEN_JAWS = 0x7010100
+_GEN_MOBY = 0x7020000
+_GEN_ORCA = 0x7020100
+_GEN_RIP0 = 0x7030000
+_GEN_RIP1 = 0x7030100
+_GEN_RIPT = 0x8000000
+_GEN_HAPI = 0x8000100
+_GEN_FRTR = 0x8010000
+_GEN_NJMA = 0x8010100
+_GEN_KANA = 0x8010200
+_GEN_NDUU = 0x8010300
+_GEN_PIPE = 0x8020000
+_GEN_ERA1 = 0x9000100
 
 
 class OneFSFeature(Enum):
@@ -75,143 +98,126 @@ class OneFSFeature(Enum):
     # translates to
     #  PIPE_UAPI_OVERRIDES = (0x8010300, 0)
 
-    _GEN = {
-        "INIT": 0x0000000,
-        "JAWS": 0x7010100,
-        "MOBY": 0x7020000,
-        "ORCA": 0x7020100,
-        "RIP0": 0x7030000,
-        "RIP1": 0x7030100,
-        "RIPT": 0x8000000,
-        "HAPI": 0x8000100,
-        "FRTR": 0x8010000,
-        "NJMA": 0x8010100,
-        "KANA": 0x8010200,
-        "NDUU": 0x8010300,
-        "PIPE": 0x8020000,
-        "ERA1": 0x9000100,
-    }
-
     # pylint: disable=invalid-name
-    FOREVER = (_GEN["INIT"], 0)
-
-    JAWS_RU = (_GEN["JAWS"], 0)
-
-    MOBY_PROTECTION = (_GEN["MOBY"], 0)
-    MOBY_SNAPDELETE = (_GEN["MOBY"], 1)
-    MOBY_RU = (_GEN["MOBY"], 2)
-    MOBY_UNFS = (_GEN["MOBY"], 3)
-    MOBY_AUTH_UPGRADE = (_GEN["MOBY"], 4)
-
-    ORCA_RU = (_GEN["ORCA"], 0)
-    RIPT_CONSISTENT_HASH = (_GEN["ORCA"], 1)
-
-    RIPT_RBM_VERSIONING = (_GEN["RIP0"], 0)
-
-    BATCH_ERROR_DSR = (_GEN["RIP1"], 1)
-    RIPTIDE_MEDIASCAN = (_GEN["RIP1"], 2)
-    RIPT_8K_INODES = (_GEN["RIP1"], 3)
-
-    RIPT_DEDUPE = (_GEN["RIPT"], 0)
-    RIPTIDE_TRUNCATE = (_GEN["RIPT"], 1)
-    RIPTIDE_CHANGELISTCREATE = (_GEN["RIPT"], 2)
-    RIPT_GMP_SERVICES = (_GEN["RIPT"], 3)
-    RIPT_NLM = (_GEN["RIPT"], 4)
-    RIPTIDE_FSA = (_GEN["RIPT"], 5)
-    RIPT_SMARTPOOLS = (_GEN["RIPT"], 6)
-    RIPT_AUTH_UPGRADE = (_GEN["RIPT"], 7)
-    RIPT_CELOG_UPGRADE = (_GEN["RIPT"], 8)
-
-    HALFPIPE_PARTITIONED_PERFORMANCE = (_GEN["HAPI"], 0)
-    HP_JE = (_GEN["HAPI"], 1)
-    HP_WORM = (_GEN["HAPI"], 2)
-    HP_PROXY = (_GEN["HAPI"], 3)
-    HALFPIPE_CONTAINERS = (_GEN["HAPI"], 4)
-    HP_NEEDS_NDU_FLAG = (_GEN["HAPI"], 5)
-    HP_RANGER = (_GEN["HAPI"], 6)
-    HP_AMBARI_METRICS = (_GEN["HAPI"], 7)
-    HP_DATANODE_WIRE_ENCRYPTION = (_GEN["HAPI"], 8)
-
-    FT_SMARTPOOLS = (_GEN["FRTR"], 0)
-    FRT_MIRRORED_JOURNAL = (_GEN["FRTR"], 1)
-    FRT_LIN_SUPER_DRIVE_QUORUM = (_GEN["FRTR"], 2)
-    FREIGHT_TRAINS_LAYOUT = (_GEN["FRTR"], 3)
-    FT_ESRS = (_GEN["FRTR"], 4)
-    FRT_COMPRESSED_INODES = (_GEN["FRTR"], 5)
-    FTR_LICENSE_MIGRATION = (_GEN["FRTR"], 6)
-
-    PIPE_ITER_MARK = (_GEN["NJMA"], 0)
-    NIIJIMA_CPOOL_GOOGLE_XML = (_GEN["NJMA"], 1)
-    NJMA_HDFS_INOTIFY = (_GEN["NJMA"], 2)
-    NJMA_HDFS_FSIMAGE = (_GEN["NJMA"], 3)
-    NIIJIMA_CLUSTER_TIME = (_GEN["NJMA"], 4)
-    NIIJIMA_SMB = (_GEN["NJMA"], 5)
-    NIIJIMA_ESRS = (_GEN["NJMA"], 6)
-
-    KANA_HDFS_REF_BY_INODE = (_GEN["KANA"], 0)
-    KANA_WEBHDFS_DELEGATION_TOKENS = (_GEN["KANA"], 1)
-
-    PIPE_UAPI_OVERRIDES = (_GEN["NDUU"], 0)
-
-    PIPE_AUTH_AWS_V4 = (_GEN["PIPE"], 0)
-    PIPE_HANGDUMP = (_GEN["PIPE"], 1)
-    PIPE_GMP_CFG_GEN = (_GEN["PIPE"], 2)
-    PIPE_EXT_GROUP = (_GEN["PIPE"], 3)
-    PIPE_EXT_GROUP_MSG = (_GEN["PIPE"], 4)
-    PIPE_JE = (_GEN["PIPE"], 5)
-    PIPE_IFS_DOMAINS = (_GEN["PIPE"], 6)
-    PIPE_CPOOL_SECURE_KEY = (_GEN["PIPE"], 7)
-    PIPE_CPOOL_C2S = (_GEN["PIPE"], 8)
-    PIPE_ISI_CERTS = (_GEN["PIPE"], 9)
-    PIPE_NDMP = (_GEN["PIPE"], 10)
-    PIPE_ZONED_ROLES = (_GEN["PIPE"], 11)
-    FT_JE_ZOMBIE = (_GEN["PIPE"], 12)
-    PIPE_CPOOL_GOOGLE_XML = (_GEN["PIPE"], 13)
-    PIPE_SIQ = (_GEN["PIPE"], 14)
-    PIPE_QUOTAS_MS = (_GEN["PIPE"], 15)
-    PIPE_QUOTA_USER_CONTAINERS = (_GEN["PIPE"], 16)
-    PIPE_TREEDELETE = (_GEN["PIPE"], 17)
-    PIPE_DOMAIN_SNAPSHOTS = (_GEN["PIPE"], 18)
-    PIPE_QUOTA_DDQ = (_GEN["PIPE"], 19)
-    PIPE_ARRAYD = (_GEN["PIPE"], 20)
-    PIPE_FLEXNET_V4 = (_GEN["PIPE"], 21)
-    PIPE_ISI_DAEMON_IPV6 = (_GEN["PIPE"], 22)
-    PIPE_JE_PREP = (_GEN["PIPE"], 23)
-    PIPE_IFS_LFN = (_GEN["PIPE"], 24)
-    PIPE_SNAP_SCHED_TARDIS = (_GEN["PIPE"], 25)
-    PIPE_DRIVE_INTEROP = (_GEN["PIPE"], 26)
-    PIPE_READ_BLOCKS = (_GEN["PIPE"], 27)
-    PIPE_IFS_BCM = (_GEN["PIPE"], 28)
-    PIPE_EXT_GRP_SRO = (_GEN["PIPE"], 29)
-    PIPE_HDFS_EXTATTR = (_GEN["PIPE"], 30)
-    PIPE_CP_2_0 = (_GEN["PIPE"], 31)
-    PIPE_FILEPOLICY = (_GEN["PIPE"], 32)
-    PIPE_COAL_SUSP_AGGR = (_GEN["PIPE"], 34)
-    PIPE_SMARTCONNECT_DNS = (_GEN["PIPE"], 35)
-    PIPE_PDM_ENC_INATTR = (_GEN["PIPE"], 36)
-    PIPE_NDMP_REDIRECTOR = (_GEN["PIPE"], 38)
-    PIPE_ISI_CBIND_D = (_GEN["PIPE"], 39)
-    PIPE_SPARSE_PUNCH = (_GEN["PIPE"], 41)
-    PIPE_SSH_CONFIG = (_GEN["PIPE"], 42)
-    PIPE_AUDIT_EVENTS = (_GEN["PIPE"], 43)
-    PIPE_PURPOSEDB = (_GEN["PIPE"], 45)
-    PIPE_JE_TREEWALK = (_GEN["PIPE"], 47)
-
-    ERA1_HDFS_TDE = (_GEN["ERA1"], 1)
-    ERA1_QUOTA_APPLOGICAL = (_GEN["ERA1"], 4)
-    ERA1_IDI_VERIFY_SNAPID = (_GEN["ERA1"], 6)
-    ERA1_CPOOL_ALIYUN = (_GEN["ERA1"], 7)
-    ERA1_STF_DUMMY_LINS = (_GEN["ERA1"], 8)
-    ERA1_PDM_COLLECT = (_GEN["ERA1"], 13)
-    ERA1_MCP_MLIST = (_GEN["ERA1"], 14)
-    ERA1_NFS_SCHED_CONFIG = (_GEN["ERA1"], 16)
-    ERA1_ADS_VOPS = (_GEN["ERA1"], 17)
-    ERA1_GMP_SERVICE_LSASS = (_GEN["ERA1"], 18)
-    ERA1_SINLIN_LOCK_ORDER = (_GEN["ERA1"], 20)
-    ERA1_LIN_MASTER_FLAGS = (_GEN["ERA1"], 23)
-    ERA1_REMOTE_SYSCTL_OBJECT = (_GEN["ERA1"], 25)
-    ERA1_LIN_BUCKET_LOCK = (_GEN["ERA1"], 27)
-    ERA1_PDM_SNAPGOV_RENAME = (_GEN["ERA1"], 34)
+    FOREVER = (_GEN_INIT, 0)
+
+    JAWS_RU = (_GEN_JAWS, 0)
+
+    MOBY_PROTECTION = (_GEN_MOBY, 0)
+    MOBY_SNAPDELETE = (_GEN_MOBY, 1)
+    MOBY_RU = (_GEN_MOBY, 2)
+    MOBY_UNFS = (_GEN_MOBY, 3)
+    MOBY_AUTH_UPGRADE = (_GEN_MOBY, 4)
+
+    ORCA_RU = (_GEN_ORCA, 0)
+    RIPT_CONSISTENT_HASH = (_GEN_ORCA, 1)
+
+    RIPT_RBM_VERSIONING = (_GEN_RIP0, 0)
+
+    BATCH_ERROR_DSR = (_GEN_RIP1, 1)
+    RIPTIDE_MEDIASCAN = (_GEN_RIP1, 2)
+    RIPT_8K_INODES = (_GEN_RIP1, 3)
+
+    RIPT_DEDUPE = (_GEN_RIPT, 0)
+    RIPTIDE_TRUNCATE = (_GEN_RIPT, 1)
+    RIPTIDE_CHANGELISTCREATE = (_GEN_RIPT, 2)
+    RIPT_GMP_SERVICES = (_GEN_RIPT, 3)
+    RIPT_NLM = (_GEN_RIPT, 4)
+    RIPTIDE_FSA = (_GEN_RIPT, 5)
+    RIPT_SMARTPOOLS = (_GEN_RIPT, 6)
+    RIPT_AUTH_UPGRADE = (_GEN_RIPT, 7)
+    RIPT_CELOG_UPGRADE = (_GEN_RIPT, 8)
+
+    HALFPIPE_PARTITIONED_PERFORMANCE = (_GEN_HAPI, 0)
+    HP_JE = (_GEN_HAPI, 1)
+    HP_WORM = (_GEN_HAPI, 2)
+    HP_PROXY = (_GEN_HAPI, 3)
+    HALFPIPE_CONTAINERS = (_GEN_HAPI, 4)
+    HP_NEEDS_NDU_FLAG = (_GEN_HAPI, 5)
+    HP_RANGER = (_GEN_HAPI, 6)
+    HP_AMBARI_METRICS = (_GEN_HAPI, 7)
+    HP_DATANODE_WIRE_ENCRYPTION = (_GEN_HAPI, 8)
+
+    FT_SMARTPOOLS = (_GEN_FRTR, 0)
+    FRT_MIRRORED_JOURNAL = (_GEN_FRTR, 1)
+    FRT_LIN_SUPER_DRIVE_QUORUM = (_GEN_FRTR, 2)
+    FREIGHT_TRAINS_LAYOUT = (_GEN_FRTR, 3)
+    FT_ESRS = (_GEN_FRTR, 4)
+    FRT_COMPRESSED_INODES = (_GEN_FRTR, 5)
+    FTR_LICENSE_MIGRATION = (_GEN_FRTR, 6)
+
+    PIPE_ITER_MARK = (_GEN_NJMA, 0)
+    NIIJIMA_CPOOL_GOOGLE_XML = (_GEN_NJMA, 1)
+    NJMA_HDFS_INOTIFY = (_GEN_NJMA, 2)
+    NJMA_HDFS_FSIMAGE = (_GEN_NJMA, 3)
+    NIIJIMA_CLUSTER_TIME = (_GEN_NJMA, 4)
+    NIIJIMA_SMB = (_GEN_NJMA, 5)
+    NIIJIMA_ESRS = (_GEN_NJMA, 6)
+
+    KANA_HDFS_REF_BY_INODE = (_GEN_KANA, 0)
+    KANA_WEBHDFS_DELEGATION_TOKENS = (_GEN_KANA, 1)
+
+    PIPE_UAPI_OVERRIDES = (_GEN_NDUU, 0)
+
+    PIPE_AUTH_AWS_V4 = (_GEN_PIPE, 0)
+    PIPE_HANGDUMP = (_GEN_PIPE, 1)
+    PIPE_GMP_CFG_GEN = (_GEN_PIPE, 2)
+    PIPE_EXT_GROUP = (_GEN_PIPE, 3)
+    PIPE_EXT_GROUP_MSG = (_GEN_PIPE, 4)
+    PIPE_JE = (_GEN_PIPE, 5)
+    PIPE_IFS_DOMAINS = (_GEN_PIPE, 6)
+    PIPE_CPOOL_SECURE_KEY = (_GEN_PIPE, 7)
+    PIPE_CPOOL_C2S = (_GEN_PIPE, 8)
+    PIPE_ISI_CERTS = (_GEN_PIPE, 9)
+    PIPE_NDMP = (_GEN_PIPE, 10)
+    PIPE_ZONED_ROLES = (_GEN_PIPE, 11)
+    FT_JE_ZOMBIE = (_GEN_PIPE, 12)
+    PIPE_CPOOL_GOOGLE_XML = (_GEN_PIPE, 13)
+    PIPE_SIQ = (_GEN_PIPE, 14)
+    PIPE_QUOTAS_MS = (_GEN_PIPE, 15)
+    PIPE_QUOTA_USER_CONTAINERS = (_GEN_PIPE, 16)
+    PIPE_TREEDELETE = (_GEN_PIPE, 17)
+    PIPE_DOMAIN_SNAPSHOTS = (_GEN_PIPE, 18)
+    PIPE_QUOTA_DDQ = (_GEN_PIPE, 19)
+    PIPE_ARRAYD = (_GEN_PIPE, 20)
+    PIPE_FLEXNET_V4 = (_GEN_PIPE, 21)
+    PIPE_ISI_DAEMON_IPV6 = (_GEN_PIPE, 22)
+    PIPE_JE_PREP = (_GEN_PIPE, 23)
+    PIPE_IFS_LFN = (_GEN_PIPE, 24)
+    PIPE_SNAP_SCHED_TARDIS = (_GEN_PIPE, 25)
+    PIPE_DRIVE_INTEROP = (_GEN_PIPE, 26)
+    PIPE_READ_BLOCKS = (_GEN_PIPE, 27)
+    PIPE_IFS_BCM = (_GEN_PIPE, 28)
+    PIPE_EXT_GRP_SRO = (_GEN_PIPE, 29)
+    PIPE_HDFS_EXTATTR = (_GEN_PIPE, 30)
+    PIPE_CP_2_0 = (_GEN_PIPE, 31)
+    PIPE_FILEPOLICY = (_GEN_PIPE, 32)
+    PIPE_COAL_SUSP_AGGR = (_GEN_PIPE, 34)
+    PIPE_SMARTCONNECT_DNS = (_GEN_PIPE, 35)
+    PIPE_PDM_ENC_INATTR = (_GEN_PIPE, 36)
+    PIPE_NDMP_REDIRECTOR = (_GEN_PIPE, 38)
+    PIPE_ISI_CBIND_D = (_GEN_PIPE, 39)
+    PIPE_SPARSE_PUNCH = (_GEN_PIPE, 41)
+    PIPE_SSH_CONFIG = (_GEN_PIPE, 42)
+    PIPE_AUDIT_EVENTS = (_GEN_PIPE, 43)
+    PIPE_PURPOSEDB = (_GEN_PIPE, 45)
+    PIPE_JE_TREEWALK = (_GEN_PIPE, 47)
+
+    ERA1_HDFS_TDE = (_GEN_ERA1, 1)
+    ERA1_QUOTA_APPLOGICAL = (_GEN_ERA1, 4)
+    ERA1_IDI_VERIFY_SNAPID = (_GEN_ERA1, 6)
+    ERA1_CPOOL_ALIYUN = (_GEN_ERA1, 7)
+    ERA1_STF_DUMMY_LINS = (_GEN_ERA1, 8)
+    ERA1_PDM_COLLECT = (_GEN_ERA1, 13)
+    ERA1_MCP_MLIST = (_GEN_ERA1, 14)
+    ERA1_NFS_SCHED_CONFIG = (_GEN_ERA1, 16)
+    ERA1_ADS_VOPS = (_GEN_ERA1, 17)
+    ERA1_GMP_SERVICE_LSASS = (_GEN_ERA1, 18)
+    ERA1_SINLIN_LOCK_ORDER = (_GEN_ERA1, 20)
+    ERA1_LIN_MASTER_FLAGS = (_GEN_ERA1, 23)
+    ERA1_REMOTE_SYSCTL_OBJECT = (_GEN_ERA1, 25)
+    ERA1_LIN_BUCKET_LOCK = (_GEN_ERA1, 27)
+    ERA1_PDM_SNAPGOV_RENAME = (_GEN_ERA1, 34)
     # pylint: enable=invalid-name
 
 
@@ -286,6 +292,11 @@ class APIError(_BaseAPIError):
     )
     # pylint: enable=invalid-name
 
+    def __init__(self, exc):
+        super().__init__(exc)
+        self._errors = None
+        self._messages = None
+
     def __str__(self):
         try:
             return "\n".join(error["message"] for error in self.errors()) or str(
@@ -296,6 +307,8 @@ class APIError(_BaseAPIError):
 
     def errors(self):
         """Get errors listed in the exception."""
+        if self._errors is not None:
+            return self._errors
         try:
             json_body = json.loads(self.exc.body)
         except (
@@ -312,7 +325,8 @@ class APIError(_BaseAPIError):
             TypeError,  # json_body['errors'] is not iterable.
         ) as exc:
             raise MalformedAPIError(self.exc) from exc
-        return json_body["errors"]
+        self._errors = json_body["errors"]
+        return self._errors
 
     def filtered_errors(self, filter_func):
         """Arbitrarily filter errors in the exception."""
@@ -320,162 +334,92 @@ class APIError(_BaseAPIError):
             if filter_func(error):
                 yield error
 
+    def _has_error_message(self, message):
+        if self._messages is None:
+            self._messages = frozenset(error["message"] for error in self.errors())
+        return message in self._messages
+
     def gid_already_exists_error(self, gid):
         """Returns True if the exception contains a GID already exists error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.gid_already_exists_error_format.format(gid),
-            )
-        )
+        return self._has_error_message(self.gid_already_exists_error_format.format(gid))
 
     def group_already_exists_error(self, group_name):
         """Returns True if the exception contains a group already exists error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.group_already_exists_error_format.format(
-                    group_name,
-                ),
-            )
+        return self._has_error_message(
+            self.group_already_exists_error_format.format(group_name)
         )
 
     def group_not_found_error(self, group_name):
         """Returns True if the exception contains a group not found error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.group_not_found_error_format.format(
-                    group_name,
-                ),
-            )
+        return self._has_error_message(
+            self.group_not_found_error_format.format(group_name)
         )
 
     def group_unresolvable_error(self, group_name):
         """Returns True if the exception contains an unresolvable group error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.group_unresolvable_error_format.format(
-                    group_name,
-                ),
-            )
+        return self._has_error_message(
+            self.group_unresolvable_error_format.format(group_name)
         )
 
     def license_expired_error(self, license_name):
         """Returns True if the exception contains an expired license error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.license_expired_error_format.format(
-                    license_name,
-                ),
-            )
+        return self._has_error_message(
+            self.license_expired_error_format.format(license_name)
         )
 
     def license_missing_error(self, license_name):
         """Returns True if the exception contains a missing license error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.license_missing_error_format.format(
-                    license_name,
-                ),
-            )
+        return self._has_error_message(
+            self.license_missing_error_format.format(license_name)
         )
 
     def proxy_user_already_exists_error(self, proxy_user_name):
         """Returns True if the exception contains a proxy user already exists error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.proxy_user_already_exists_error_format.format(
-                    proxy_user_name,
-                ),
-            )
+        return self._has_error_message(
+            self.proxy_user_already_exists_error_format.format(proxy_user_name)
         )
 
     def try_again_error(self):
         """Returns True if the exception indicated PAPI is temporarily unavailable."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"] == self.try_again_error_format,
-            )
-        )
+        return self._has_error_message(self.try_again_error_format)
 
     def uid_already_exists_error(self, uid):
         """Returns True if the exception contains a UID already exists error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.uid_already_exists_error_format.format(uid),
-            )
-        )
+        return self._has_error_message(self.uid_already_exists_error_format.format(uid))
 
     def user_already_exists_error(self, user_name):
         """Returns True if the exception contains a user already exists error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.user_already_exists_error_format.format(
-                    user_name,
-                ),
-            )
+        return self._has_error_message(
+            self.user_already_exists_error_format.format(user_name)
         )
 
     def user_already_in_group_error(self, uid, group_name):
         """Returns True if the exception contains a user already in group error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.user_already_in_group_error_format.format(
-                    uid,
-                    group_name,
-                ),
-            )
+        return self._has_error_message(
+            self.user_already_in_group_error_format.format(uid, group_name)
         )
 
     def user_not_found_error(self, user_name):
         """Returns True if the exception contains a user not found error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.user_not_found_error_format.format(
-                    user_name,
-                ),
-            )
+        return self._has_error_message(
+            self.user_not_found_error_format.format(user_name)
         )
 
     def user_unresolvable_error(self, user_name):
         """Returns True if the exception contains an unresolvable user error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.user_unresolvable_error_format.format(
-                    user_name,
-                ),
-            )
+        return self._has_error_message(
+            self.user_unresolvable_error_format.format(user_name)
         )
 
     def zone_not_found_error(self, zone_name):
         """Returns True if the exception contains a zone not found error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.zone_not_found_error_format.format(
-                    zone_name,
-                ),
-            )
+        return self._has_error_message(
+            self.zone_not_found_error_format.format(zone_name)
         )
 
     def dir_path_already_exists_error(self):
         """Returns True if the exception contains a directory path already exist error."""
-        return any(
-            self.filtered_errors(
-                lambda error: error["message"]
-                == self.dir_path_already_exists_error_format,
-            )
-        )
+        return self._has_error_message(self.dir_path_already_exists_error_format)
 
 
 class MissingLicenseError(OneFSError):
@@ -518,6 +462,7 @@ class UnsupportedOperation(OneFSError):
     """
 
 
+@functools.lru_cache(maxsize=32)
 def sdk_for_revision(revision, strict=False):
     """Get the SDK that is intended to work with a given OneFS revision."""
     # pylint: disable=too-many-return-statements,import-outside-toplevel
@@ -567,6 +512,7 @@ def accesses_onefs(func):
     """Decorate a Client method that makes an SDK call directly."""
 
     def _decorated(self, *args, **kwargs):
+        attempt = 0
         while True:
             try:
                 return func(self, *args, **kwargs)
@@ -578,19 +524,21 @@ def accesses_onefs(func):
             except (
                 self._sdk.rest.ApiException  # pylint: disable=protected-access
             ) as exc:
-                if all(
-                    [
-                        # https://github.com/PyCQA/pylint/issues/2841
-                        not exc.body,  # pylint: disable=no-member
-                        "CERTIFICATE_VERIFY_FAILED"
-                        in (exc.reason or ""),  # pylint: disable=no-member
-                    ]
+                if (
+                    # https://github.com/PyCQA/pylint/issues/2841
+                    not exc.body  # pylint: disable=no-member
+                    and "CERTIFICATE_VERIFY_FAILED"
+                    in (exc.reason or "")  # pylint: disable=no-member
                 ):
                     raise OneFSCertificateError from exc
                 wrapped_exc = APIError(exc)
-                if not wrapped_exc.try_again_error():
+                attempt += 1
+                if attempt >= RETRY_MAX_ATTEMPTS or not wrapped_exc.try_again_error():
                     raise wrapped_exc from exc
-                time.sleep(2)
+                time.sleep(
+                    min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempt - 1))
+                    + random.uniform(0, RETRY_BASE_DELAY)
+                )
                 LOGGER.info(wrapped_exc.try_again_error_format)
 
     return _decorated
@@ -603,6 +551,23 @@ class OneFSValueError(OneFSError, ValueError):
     """
 
 
+def _resolve_address(address):
+    # Prefer IPv4, as socket.gethostbyname does, but also support IPv6-only names.
+    addrinfo = socket.getaddrinfo(address, None, type=socket.SOCK_STREAM)
+    for family, _, _, _, sockaddr in addrinfo:
+        if family == socket.AF_INET:
+            return sockaddr[0]
+    return addrinfo[0][4][0]
+
+
+def _apply_settings(model, settings, kind):
+    for key, value in settings.items():
+        # Every generated SDK model lists its attributes in swagger_types.
+        if key not in model.swagger_types:
+            raise OneFSValueError(f'"{key}" is not a valid {kind} setting.')
+        setattr(model, key, value)
+
+
 def _license_is_active(license_):
     return license_.status.lower() in ["activated", "evaluation", "licensed"]
 
@@ -621,6 +586,14 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         self._sdk = sdk_for_revision(ONEFS_RELEASES["8.0.0.0"])
         # Attributes with setters (see below) depend on having a Configuration object to manipulate.
         self._configuration = self._sdk.Configuration()
+        self._cached_api_client = None
+        # Zone name (lowercase) -> zone, as of the last time zones were listed
+        self._zones_by_name = {}
+        # (name, zone) -> UID/GID, for users and groups that have been looked up
+        self._uids = {}
+        self._gids = {}
+        # Like the revision, committed features are read once per host (or refresh).
+        self._committed_features = None
         self._address = None  # This will truly be set last.
 
         # Set attributes with setters last.
@@ -633,16 +606,30 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
 
     @property
     def _api_client(self):
-        return self._sdk.ApiClient(self._configuration)
+        # Each ApiClient owns a urllib3 pool (and a thread pool), so one is reused
+        # to keep connections to OneFS alive across calls.
+        # It is discarded whenever something it was built from changes.
+        if self._cached_api_client is None:
+            self._cached_api_client = self._sdk.ApiClient(self._configuration)
+        return self._cached_api_client
+
+    def _cached_zone(self, name):
+        # Zone names are NOT case-sensitive.
+        zone = self._zones_by_name.get(name.lower())
+        # The zone may have been created since zones were last listed.
+        return self._zone(name) if zone is None else zone
+
+    @property
+    def _group_member_cls(self):
+        if self._revision < ONEFS_RELEASES["8.0.1.0"]:
+            return self._sdk.GroupMember
+        return self._sdk.AuthAccessAccessItemFileGroup
 
-    @accesses_onefs
     def _groups(self, zone=None):
-        return (
-            self._sdk.AuthApi(self._api_client)
-            .list_auth_groups(
-                zone=zone or self.default_zone,
-            )
-            .groups
+        return self._list_all(
+            self._sdk.AuthApi(self._api_client).list_auth_groups,
+            "groups",
+            zone=zone or self.default_zone,
         )
 
     @accesses_onefs
@@ -656,6 +643,20 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     def _license(self, name):
         return self._sdk.LicenseApi(self._api_client).get_license_license(name)
 
+    def _list_all(self, list_func, items_attr, **kwargs):
+        """Yield every item of a resumable PAPI listing, one page at a time."""
+        response = self._list_page(list_func, **kwargs)
+        while True:
+            yield from getattr(response, items_attr)
+            if not response.resume:
+                return
+            # PAPI does not accept other options alongside a resume token.
+            response = self._list_page(list_func, resume=response.resume)
+
+    @accesses_onefs
+    def _list_page(self, list_func, **kwargs):
+        return list_func(**kwargs)
+
     @accesses_onefs
     def _pools(self, *args, **kwargs):
         return (
@@ -676,6 +677,8 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         except AttributeError as exc:
             raise UndeterminableVersion from exc
         self._sdk = sdk_for_revision(self._revision)
+        self._cached_api_client = None
+        self.refresh()
 
     @accesses_onefs
     def _upgrade_cluster(self):
@@ -686,15 +689,17 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         return self._sdk.ClusterApi(self._api_client).get_cluster_version()
 
     def _zone(self, name):
-        for zone in self._zones():
-            # Zone names are NOT case-sensitive.
-            if zone.name.lower() == name.lower():
-                return zone
-        raise MissingZoneError(name)
+        # Zone names are NOT case-sensitive.
+        # Every listing also refreshes the zones used to resolve paths.
+        self._zones_by_name = {zone.name.lower(): zone for zone in self._zones()}
+        zone = self._zones_by_name.get(name.lower())
+        if zone is None:
+            raise MissingZoneError(name)
+        return zone
 
     def _zone_real_path(self, path, zone=None):
         return posixpath.join(
-            self.zone_settings(zone=zone or self.default_zone)["path"],
+            self._cached_zone(zone or self.default_zone).path,
             path.lstrip(posixpath.sep),
         )
 
@@ -728,14 +733,9 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def add_user_to_group(self, user_name, group_name, zone=None):
         """Add a user to a group."""
-        group_member_cls = (
-            self._sdk.GroupMember
-            if self._revision < ONEFS_RELEASES["8.0.1.0"]
-            else self._sdk.AuthAccessAccessItemFileGroup
-        )
         try:
             self._sdk.AuthGroupsApi(self._api_client).create_group_member(
-                group_member_cls(
+                self._group_member_cls(
                     type="user",
                     name=user_name,
                 ),
@@ -778,7 +778,7 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
             # due to changes not propagating fast enough across a cluster.
             # This problem gets worse on larger clusters.
             # So, we will choose 1 node to connect to and use that.
-            netloc = socket.gethostbyname(address)
+            netloc = _resolve_address(address)
         except socket.gaierror as exc:
             raise OneFSConnectionError from exc
         if ":" in netloc:  # IPv6
@@ -799,8 +799,7 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         if not _license_is_active(license_):
             if (
                 license_.expiration
-                and datetime.strptime(license_.expiration, "%Y-%m-%d").date()
-                < date.today()
+                and date.fromisoformat(license_.expiration) < date.today()
             ):
                 raise ExpiredLicenseError(name)
             raise MissingLicenseError(name)
@@ -824,10 +823,15 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         )
 
     @accesses_onefs
-    def chown(self, path, owner=None, group=None, zone=None):
-        """Change the owning user and/or group of a (zone-root-relative) path."""
+    def chown(self, path, owner=None, group=None, zone=None, mode=None):
+        """
+        Change the owning user and/or group of a (zone-root-relative) path.
+        If an (integer) mode is also given, it is set in the same request.
+        """
         real_path = self._zone_real_path(path, zone=zone)
         ns_acl_kwargs = {"authoritative": "mode"}
+        if mode is not None:
+            ns_acl_kwargs["mode"] = f"{mode:o}"
         if owner is not None:
             # Get the UID of the owner to avoid name resolution problems across zones
             # (e.g. using the System zone to configure a different zone).
@@ -848,6 +852,11 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
             namespace_acl=self._sdk.NamespaceAcl(**ns_acl_kwargs),
         )
 
+    def clear_name_cache(self):
+        """Forget cached UIDs and GIDs (e.g. after users or groups change out-of-band)."""
+        self._uids = {}
+        self._gids = {}
+
     @accesses_onefs
     def create_auth_provider(self, realm, user, password):
         """Create a Kerberos auth provider."""
@@ -862,6 +871,7 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def create_group(self, name, gid=None, zone=None):
         """Create a group."""
+        self._gids.pop((name, zone or self.default_zone), None)
         self._sdk.AuthApi(self._api_client).create_auth_group(
             self._sdk.AuthGroupCreateParams(
                 name=name,
@@ -869,16 +879,15 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
             ),
             zone=zone or self.default_zone,
         )
+        if gid is not None:
+            # The GID is already known, so gid_of_group need not look it up.
+            self._gids[(name, zone or self.default_zone)] = gid
 
     @accesses_onefs
     def create_hdfs_proxy_user(self, name, members=None, zone=None):
         """Create an HDFS proxy user."""
         if members is not None:
-            group_member_cls = (
-                self._sdk.GroupMember
-                if self._revision < ONEFS_RELEASES["8.0.1.0"]
-                else self._sdk.AuthAccessAccessItemFileGroup
-            )
+            group_member_cls = self._group_member_cls
             members = [
                 group_member_cls(
                     name=member_name,
@@ -936,16 +945,12 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         self, name, primary_group_name, uid=None, zone=None, enabled=None, password=None
     ):
         """Create a user."""
-        group_member_cls = (
-            self._sdk.GroupMember
-            if self._revision < ONEFS_RELEASES["8.0.1.0"]
-            else self._sdk.AuthAccessAccessItemFileGroup
-        )
+        self._uids.pop((name, zone or self.default_zone), None)
         self._sdk.AuthApi(self._api_client).create_auth_user(
             self._sdk.AuthUserCreateParams(
                 name=name,
                 enabled=enabled,
-                primary_group=group_member_cls(
+                primary_group=self._group_member_cls(
                     type="group",
                     name=primary_group_name,
                 ),
@@ -963,6 +968,8 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def delete_group(self, name, zone=None):
         """Delete a group."""
+        # The group may also be cached under another name (e.g. "GID:<n>").
+        self._gids = {}
         self._sdk.AuthApi(self._api_client).delete_auth_group(
             name,
             zone=zone or self.default_zone,
@@ -985,15 +992,22 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         """Delete a Kerberos realm configuration."""
         self._sdk.AuthApi(self._api_client).delete_settings_krb5_realm(name)
 
-    @accesses_onefs
     def delete_spn(self, spn, provider):
         """Delete a Kerberos SPN."""
+        self.delete_spns([spn], provider)
+
+    @accesses_onefs
+    def delete_spns(self, spns, provider):
+        """Delete Kerberos SPNs with a single update of the provider's keytab."""
+        unwanted_spns = {
+            unwanted_spn for spn in spns for unwanted_spn in (spn, spn + "@" + provider)
+        }
         self._sdk.AuthApi(self._api_client).update_providers_krb5_by_id(
             self._sdk.ProvidersKrb5IdParams(
                 keytab_entries=[
                     keytab_entry
                     for keytab_entry in self._keytab_entries(provider=provider)
-                    if keytab_entry.spn not in [spn, spn + "@" + provider]
+                    if keytab_entry.spn not in unwanted_spns
                 ]
             ),
             provider,
@@ -1002,23 +1016,31 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def delete_user(self, name, zone=None):
         """Delete a user."""
+        # The user may also be cached under another name (e.g. "UID:<n>").
+        self._uids = {}
         self._sdk.AuthApi(self._api_client).delete_auth_user(
             name,
             zone=zone or self.default_zone,
         )
 
     def feature_is_supported(self, feature):
-        """Determine if a given OneFSFeature is supported."""
+        """
+        Determine if a given OneFSFeature is supported.
+        Committed features are read once, so call refresh after the cluster is upgraded.
+        """
 
         feature_gen, feature_bit = feature.value
 
-        upgrade_cluster = self._upgrade_cluster()
-        try:
-            committed_features = upgrade_cluster.committed_features
-        except AttributeError as exc:
-            raise UnsupportedOperation(
-                "OneFS 8.2.0 or later is required for feature flag support.",
-            ) from exc
+        committed_features = self._committed_features
+        if committed_features is None:
+            upgrade_cluster = self._upgrade_cluster()
+            try:
+                committed_features = upgrade_cluster.committed_features
+            except AttributeError as exc:
+                raise UnsupportedOperation(
+                    "OneFS 8.2.0 or later is required for feature flag support.",
+                ) from exc
+            self._committed_features = committed_features
 
         entries_for_gen = [
             entry.bits
@@ -1037,6 +1059,7 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def flush_auth_cache(self, zone=None):
         """Flush the Security Objects Cache."""
+        self.clear_name_cache()
         if self._revision < ONEFS_RELEASES["8.0.1.0"]:
             _zone = zone or self.default_zone
             if _zone and _zone.lower() != "system":
@@ -1072,6 +1095,11 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     @accesses_onefs
     def gid_of_group(self, group_name, zone=None):
         """Get the GID of a group."""
+        key = (group_name, zone or self.default_zone)
+        try:
+            return self._gids[key]
+        except KeyError:
+            pass
         auth_groups = self._sdk.AuthApi(self._api_client).get_auth_group(
             group_name,
             zone=zone or self.default_zone,
@@ -1079,7 +1107,8 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         assert (
             len(auth_groups.groups) == 1
         ), "Do you have duplicate groups (e.g. local and LDAP)?"
-        return int(auth_groups.groups[0].gid.id.split(":")[1])
+        gid = self._gids[key] = int(auth_groups.groups[0].gid.id.split(":")[1])
+        return gid
 
     def groups(self, zone=None):
         """Get the auth groups OneFS knows about."""
@@ -1237,6 +1266,12 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         for realm in self._realms():
             yield realm.realm
 
+    def refresh(self):
+        """Forget cached zones, UIDs, GIDs, and committed features (e.g. after an upgrade)."""
+        self._zones_by_name = {}
+        self.clear_name_cache()
+        self._committed_features = None
+
     def revision(self):
         """Get the revision number of the cluster."""
         revisions = set(self.revisions().values())
@@ -1259,14 +1294,20 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
 
     def smartconnect_zone(self, smartconnect):
         """Get the access zone name associated with a SmartConnect name."""
+        smartconnect = smartconnect.lower()
         for pool in self._pools():
-            if pool.sc_dns_zone.lower() == smartconnect.lower():
+            if pool.sc_dns_zone.lower() == smartconnect:
                 return pool.access_zone
         return None
 
     @accesses_onefs
     def uid_of_user(self, user_name, zone=None):
         """Get the UID of a user."""
+        key = (user_name, zone or self.default_zone)
+        try:
+            return self._uids[key]
+        except KeyError:
+            pass
         auth_users = self._sdk.AuthApi(self._api_client).get_auth_user(
             user_name,
             zone=zone or self.default_zone,
@@ -1274,30 +1315,21 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         assert (
             len(auth_users.users) == 1
         ), "Do you have duplicate users (e.g. local and LDAP)?"
-        return int(auth_users.users[0].uid.id.split(":")[1])
+        uid = self._uids[key] = int(auth_users.users[0].uid.id.split(":")[1])
+        return uid
 
     @accesses_onefs
     def update_acl_settings(self, settings):
         """Set ACL settings."""
         acl_settings = self._sdk.SettingsAclsAclPolicySettings()
-        for key, value in settings.items():
-            try:
-                getattr(acl_settings, key)
-            except AttributeError as exc:
-                raise OneFSValueError(f'"{key}" is not a valid ACL setting.') from exc
-            setattr(acl_settings, key, value)
+        _apply_settings(acl_settings, settings, "ACL")
         self._sdk.AuthApi(self._api_client).update_settings_acls(acl_settings)
 
     @accesses_onefs
     def update_hdfs_settings(self, settings, zone=None):
         """Set HDFS settings for an access zone."""
         hdfs_settings = self._sdk.HdfsSettingsSettings()
-        for key, value in settings.items():
-            try:
-                getattr(hdfs_settings, key)
-            except AttributeError as exc:
-                raise OneFSValueError(f'"{key}" is not a valid HDFS setting.') from exc
-            setattr(hdfs_settings, key, value)
+        _apply_settings(hdfs_settings, settings, "HDFS")
         self._sdk.ProtocolsApi(self._api_client).update_hdfs_settings(
             hdfs_settings,
             zone=zone or self.default_zone,
@@ -1307,15 +1339,11 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     def update_zone_settings(self, settings, zone=None):
         """Set the settings for an access zone."""
         zone_settings = self._sdk.Zone()
-        for key, value in settings.items():
-            try:
-                getattr(zone_settings, key)
-            except AttributeError as exc:
-                raise OneFSValueError(f'"{key}" is not a valid zone setting.') from exc
-            setattr(zone_settings, key, value)
+        _apply_settings(zone_settings, settings, "zone")
         self._sdk.ZonesApi(self._api_client).update_zone(
             zone_settings, zone or self.default_zone
         )
+        self._zones_by_name = {}
 
     @property
     def username(self):
@@ -1340,7 +1368,6 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         ), "Do you have duplicate users (e.g. local and LDAP)?"
         return [group.name for group in auth_users.users[0].member_of]
 
-    @accesses_onefs
     def users(
         self,
         zone=None,
@@ -1348,12 +1375,10 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
         filter_=lambda _: True,
     ):
         """Get a list of users that exist in an access zone on OneFS."""
-        for user in (
-            self._sdk.AuthApi(self._api_client)
-            .list_auth_users(
-                zone=zone or self.default_zone,
-            )
-            .users
+        for user in self._list_all(
+            self._sdk.AuthApi(self._api_client).list_auth_users,
+            "users",
+            zone=zone or self.default_zone,
         ):
             if filter_(user):
                 yield key(user)
@@ -1367,6 +1392,7 @@ class BaseClient:  # pylint: disable=too-many-public-methods,too-many-instance-a
     def verify_ssl(self, verify_ssl):
         """Specify whether to verify the OneFS SSL certificate or not."""
         self._configuration.verify_ssl = bool(verify_ssl)
+        self._cached_api_client = None
 
     @property
     def zone(self):
@@ -1,7 +1,6 @@
 """Define config and fixtures for testing the functionality of isilon_hadoop_tools."""
 
 
-import configparser
 from contextlib2 import ExitStack as does_not_raise
 from enum import Enum
 import json
@@ -11,7 +10,6 @@ import tempfile
 from unittest.mock import Mock, patch  # Python 3
 import uuid
 
-import kadmin
 import pytest
 import requests
 import urllib3
@@ -21,6 +19,15 @@ from isilon_hadoop_tools import directories, identities, onefs, IsilonHadoopTool
 
 urllib3.disable_warnings()  # Without this, the SDK will emit InsecureRequestWarning on every call.
 
+try:
+    # This is how the SDK checks whether localhost is OneFS:
+    # https://github.com/Isilon/isilon_sdk_python/blob/19958108ec550865ebeb1f2a4d250322cf4681c2/isi_sdk/rest.py#L33
+    __import__("isi.rest")
+except ImportError:
+    _LOCALHOST_IS_ONEFS = False
+else:
+    _LOCALHOST_IS_ONEFS = True
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -59,6 +66,13 @@ def pytest_addoption(parser):
     )
 
 
+def pytest_configure(config):
+    # pytest-xdist registers this marker itself, but it is not installed for every run.
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run tests of the same group on one xdist worker"
+    )
+
+
 @pytest.fixture
 def max_retry_exception_mock():
     """Get an object that raises MaxRetryError (from urllib3) when called."""
@@ -75,23 +89,16 @@ def max_retry_exception_mock():
 )
 def invalid_address(request, max_retry_exception_mock):
     """Get an address that will cause connection errors for onefs.Client."""
-    try:
-        # This is how the SDK checks whether localhost is OneFS:
-        # https://github.com/Isilon/isilon_sdk_python/blob/19958108ec550865ebeb1f2a4d250322cf4681c2/isi_sdk/rest.py#L33
-        __import__("isi.rest")
-    except ImportError:
-        # Different hostnames/addresses hit errors in different code paths.
-        # The first error that can be hit is a socket.gaierror if a hostname is unresolvable.
-        # That won't get hit for addresses (e.g. 127.0.0.1 or ::1) or resolvable names, though.
-        # Instead, those connections will succeed but will not respond correctly to API requests.
-        # The first API request that's made is to get the cluster version (using isi_sdk_8_0).
-        # To avoid having to wait for such a connection to time out, here we patch that request.
-        with patch(
-            "isi_sdk_8_0.ClusterApi.get_cluster_version", max_retry_exception_mock
-        ):
-            yield request.param  # yield to keep the patch until the teardown of the test.
-    else:
+    if _LOCALHOST_IS_ONEFS:
         pytest.skip("Localhost is OneFS.")
+    # Different hostnames/addresses hit errors in different code paths.
+    # The first error that can be hit is a socket.gaierror if a hostname is unresolvable.
+    # That won't get hit for addresses (e.g. 127.0.0.1 or ::1) or resolvable names, though.
+    # Instead, those connections will succeed but will not respond correctly to API requests.
+    # The first API request that's made is to get the cluster version (using isi_sdk_8_0).
+    # To avoid having to wait for such a connection to time out, here we patch that request.
+    with patch("isi_sdk_8_0.ClusterApi.get_cluster_version", max_retry_exception_mock):
+        yield request.param  # yield to keep the patch until the teardown of the test.
 
 
 @pytest.fixture(scope="session")
@@ -117,11 +124,36 @@ def riptide_client(onefs_client):
     pytest.skip("The OneFS cluster is not running Riptide.")
 
 
+@pytest.fixture(scope="session")
+def zone_settings(onefs_client):
+    """Get the settings of the default access zone, read once per session."""
+    return onefs_client.zone_settings()
+
+
+@pytest.fixture
+def mock_sdk_client(monkeypatch):
+    """Get an instance of onefs.BaseClient whose SDK is a Mock (so no requests are made)."""
+
+    def _refresh_sdk(self):
+        self._revision = onefs.ONEFS_RELEASES["8.2.2.0"]
+        self._sdk = Mock()
+        self._cached_api_client = None
+        self.refresh()
+
+    monkeypatch.setattr(onefs.BaseClient, "_refresh_sdk", _refresh_sdk)
+    return onefs.BaseClient(address="127.0.0.1", username="root", password="")
+
+
 def new_name(request):
     """Get a name that may be used to create a new user or group."""
     return "-".join(
         [
-            request.function.__name__,
+            (
+                request.function.__name__
+                if request.scope == "function"
+                # Module-scoped requests have no test function to name things after.
+                else request.module.__name__.rpartition(".")[2]
+            ),
             str(uuid.uuid4()),
         ]
     )
@@ -176,6 +208,12 @@ def created_group(request, onefs_client):
     return _created_group(request, onefs_client)
 
 
+@pytest.fixture(scope="module")
+def created_group_module(request, onefs_client):
+    """Get an existing group with a known GID that is shared by a module's tests."""
+    return _created_group(request, onefs_client)
+
+
 def _new_user_name(request):
     return new_name(request)
 
@@ -222,6 +260,12 @@ def created_user(request, onefs_client):
     return _created_user(request, onefs_client)
 
 
+@pytest.fixture(scope="module")
+def created_user_module(request, onefs_client):
+    """Get an existing user with a known UID that is shared by a module's tests."""
+    return _created_user(request, onefs_client)
+
+
 def _deletable_proxy_user(request, onefs_client):
     user_name = _created_user(request, onefs_client)[0]
     members = []
@@ -303,9 +347,13 @@ def created_auth_provider(request, onefs_client):
     return _created_auth_provider(request, onefs_client)
 
 
+def _new_spn_name(request, onefs_client):
+    return _new_user_name(request) + "/" + onefs_client.address
+
+
 def _new_spn(request, onefs_client):
     return (
-        _new_user_name(request) + "/" + onefs_client.address,
+        _new_spn_name(request, onefs_client),
         _created_auth_provider(request, onefs_client),
     )
 
@@ -316,59 +364,92 @@ def new_spn(request, onefs_client):
     return _new_spn(request, onefs_client)
 
 
-def _remove_principal_from_kdc(
-    principal,
+def _kadmin_handle(
     realm,
     kdc,
     admin_server,
     admin_principal,
     admin_password,
 ):
-    """Delete a Kerberos principal."""
+    """Authenticate to a Kerberos administration server."""
+    import kadmin  # pylint: disable=import-outside-toplevel
+
     # Note: kadmin.init_with_password requires a Kerberos config file.
 
     # Create a temporary Kerberos config file.
-    krb5_config = configparser.ConfigParser()
-    krb5_config.optionxform = str
-    krb5_config.add_section("libdefaults")
-    krb5_config.set("libdefaults", "default_realm", realm)
-    krb5_config.add_section("realms")
-    krb5_config.set(
-        "realms",
-        realm,
-        "\n".join(
-            [
-                "{",
-                "    kdc = " + kdc,
-                "    admin_server = " + admin_server,
-                "}",
-            ]
-        ),
-    )
     with tempfile.NamedTemporaryFile(mode="w", delete=False) as krb5_conf:
-        krb5_config.write(krb5_conf)
+        krb5_conf.write(
+            "\n".join(
+                [
+                    "[libdefaults]",
+                    "default_realm = " + realm,
+                    "",
+                    "[realms]",
+                    realm + " = {",
+                    "    kdc = " + kdc,
+                    "    admin_server = " + admin_server,
+                    "}",
+                    "",
+                ]
+            )
+        )
 
     # Activate the config file via an env var.
     previous_krb5_conf = os.environ.get("KRB5_CONFIG")
     os.environ["KRB5_CONFIG"] = krb5_conf.name
+    try:
+        # Authenticate (this fetches a TGT from the KDC).
+        handle = kadmin.init_with_password(admin_principal, admin_password)
+    finally:
+        # Reset the env var.
+        if previous_krb5_conf is None:
+            del os.environ["KRB5_CONFIG"]
+        else:
+            os.environ["KRB5_CONFIG"] = previous_krb5_conf
 
-    # Delete the principal.
-    kadmin.init_with_password(admin_principal, admin_password).delete_principal(
-        principal
-    )
+        # Delete the config file.
+        os.remove(krb5_conf.name)
 
-    # Reset the env var.
-    if previous_krb5_conf is None:
-        del os.environ["KRB5_CONFIG"]
-    else:
-        os.environ["KRB5_CONFIG"] = previous_krb5_conf
+    return handle
 
-    # Delete the config file.
-    os.remove(krb5_conf.name)
 
+@pytest.fixture(scope="session")
+def kadmin_handles():
+    """Get a cache of kadmin handles, keyed by (realm, admin principal)."""
+    return {}
 
-def _deletable_spn(request, onefs_client):
-    spn, auth_provider = _new_spn(request, onefs_client)
+
+def _remove_principal_from_kdc(
+    principal,
+    realm,
+    kdc,
+    admin_server,
+    admin_principal,
+    admin_password,
+    kadmin_handles,
+):
+    """Delete a Kerberos principal."""
+    key = (realm, admin_principal)
+    try:
+        handle = kadmin_handles[key]
+    except KeyError:
+        handle = kadmin_handles[key] = _kadmin_handle(
+            realm=realm,
+            kdc=kdc,
+            admin_server=admin_server,
+            admin_principal=admin_principal,
+            admin_password=admin_password,
+        )
+    handle.delete_principal(principal)
+
+
+def _deletable_spn(request, onefs_client, kadmin_handles, auth_provider=None):
+    # Skip before creating the SPN if it could not be removed from the KDC afterwards.
+    pytest.importorskip("kadmin")
+    if auth_provider is None:
+        spn, auth_provider = _new_spn(request, onefs_client)
+    else:
+        spn = _new_spn_name(request, onefs_client)
     kadmin_username = request.config.getoption("--kadmin-username", skip=True)
     kadmin_password = request.config.getoption("--kadmin-password", skip=True)
     onefs_client.create_spn(
@@ -385,15 +466,16 @@ def _deletable_spn(request, onefs_client):
             admin_server=request.config.getoption("--kadmin-address", skip=True),
             admin_principal=kadmin_username,
             admin_password=kadmin_password,
+            kadmin_handles=kadmin_handles,
         ),
     )
     return spn, auth_provider
 
 
 @pytest.fixture
-def deletable_spn(request, onefs_client):
+def deletable_spn(request, onefs_client, kadmin_handles):
     """Get the name of an existing SPN that it is ok to delete."""
-    spn, auth_provider = _deletable_spn(request, onefs_client)
+    spn, auth_provider = _deletable_spn(request, onefs_client, kadmin_handles)
     yield spn, auth_provider
     assert (spn + "@" + auth_provider) not in onefs_client.list_spns(
         provider=auth_provider
@@ -401,24 +483,37 @@ def deletable_spn(request, onefs_client):
 
 
 @pytest.fixture
-def created_spn(request, onefs_client):
+def deletable_spns(request, onefs_client, kadmin_handles):
+    """Get the names of two existing SPNs of one auth provider that it is ok to delete."""
+    spn, auth_provider = _deletable_spn(request, onefs_client, kadmin_handles)
+    other_spn, _ = _deletable_spn(
+        request, onefs_client, kadmin_handles, auth_provider=auth_provider
+    )
+    spns = [spn, other_spn]
+    yield spns, auth_provider
+    remaining_spns = onefs_client.list_spns(provider=auth_provider)
+    assert all((spn + "@" + auth_provider) not in remaining_spns for spn in spns)
+
+
+@pytest.fixture
+def created_spn(request, onefs_client, kadmin_handles):
     """Get the name of an existing Kerberos SPN."""
-    spn, auth_provider = _deletable_spn(request, onefs_client)
+    spn, auth_provider = _deletable_spn(request, onefs_client, kadmin_handles)
     request.addfinalizer(
         lambda: onefs_client.delete_spn(spn=spn, provider=auth_provider)
     )
     return spn, auth_provider
 
 
-@pytest.fixture
-def exception():
+@pytest.fixture(
+    params=[
+        Exception,
+        IsilonHadoopToolError,
+    ]
+)
+def exception(request):
     """Get an exception."""
-    return random.choice(
-        [
-            Exception,
-            IsilonHadoopToolError,
-        ]
-    )
+    return request.param
 
 
 def _api_exception_from_http_resp(onefs_client, body):
@@ -462,6 +557,16 @@ def retriable_api_exception_mock(onefs_client):
     )
 
 
+@pytest.fixture
+def unavailable_api_exception_mock(onefs_client):
+    """Get an object that always raises a retriable ApiException (from the Isilon SDK)."""
+    return Mock(
+        side_effect=_api_exception(
+            onefs_client, messages=[onefs.APIError.try_again_error_format]
+        ),
+    )
+
+
 @pytest.fixture(
     params=[
         lambda onefs_client: (
@@ -604,6 +709,10 @@ def requests_delete_raises():
         yield
 
 
+def _pass(*_, **__):
+    pass
+
+
 @pytest.fixture(params=["cdh", "cdp", "hdp"])
 def users_groups_for_directories(request, onefs_client):
     """
@@ -613,17 +722,13 @@ def users_groups_for_directories(request, onefs_client):
     """
 
     users, groups = set(), set()
-
-    def _pass(*args, **kwargs):
-        pass
-
     identities.iterate_identities(
         {
             "cdh": identities.cdh_identities,
             "cdp": identities.cdh_identities,
             "hdp": identities.hdp_identities,
         }[request.param](onefs_client.zone),
-        create_group=lambda group_name: groups.add(group_name),
+        create_group=groups.add,
         create_user=lambda user_name, _: users.add(user_name),
         add_user_to_group=_pass,
         create_proxy_user=_pass,
@@ -1,11 +1,15 @@
 import posixpath
 import subprocess
+import sys
 import uuid
 
 import pytest
 
+# The HDFS root is global to the zone, so only one xdist worker may swap it at a time.
+pytestmark = pytest.mark.xdist_group("hdfs_root")
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def empty_hdfs_root(onefs_client):
     """Create a temporary directory and make it the HDFS root."""
     old_hdfs_root = onefs_client.hdfs_settings()["root_directory"]
@@ -45,3 +49,27 @@ def test_dry_run(script, onefs_client, dist):
             onefs_client.address,
         ]
     )
+
+
+@pytest.mark.parametrize("script", ["isilon_create_users", "isilon_create_directories"])
+def test_version_skips_onefs(script):
+    """Ensure that --version exits before isilon_hadoop_tools.onefs is imported."""
+    subprocess.check_call(
+        [
+            sys.executable,
+            "-c",
+            "\n".join(
+                [
+                    "import sys",
+                    "from isilon_hadoop_tools import _scripts",
+                    "try:",
+                    f"    _scripts.{script}(['--version'])",
+                    "except SystemExit:",
+                    "    pass",
+                    "assert 'isilon_hadoop_tools.onefs' not in sys.modules",
+                    "assert 'requests' not in sys.modules",
+                    "assert 'urllib3' not in sys.modules",
+                ]
+            ),
+        ]
+    )
@@ -1,3 +1,5 @@
+from unittest.mock import Mock
+
 import pytest
 
 import isilon_hadoop_tools.identities
@@ -15,3 +17,31 @@ import isilon_hadoop_tools.identities
 def test_log_identities(identities, zone):
     """Verify that log_identities returns None."""
     assert isilon_hadoop_tools.identities.log_identities(identities(zone)) is None
+
+
+def test_create_identities_script(tmp_path):
+    """Verify that create_identities writes one script line per identity action."""
+    script_path = tmp_path / "script.sh"
+    onefs = Mock()
+    onefs.gid_of_group.return_value = 1026
+    isilon_hadoop_tools.identities.Creator(
+        onefs=onefs,
+        onefs_zone="notSystem",
+        script_path=str(script_path),
+    ).create_identities(
+        {
+            "groups": {"group"},
+            "users": {"user": ("user", {"group"})},
+            "proxy_users": {},
+        },
+    )
+    lines = script_path.read_text().splitlines()
+    assert lines[0] == "#!/usr/bin/env sh"
+    assert lines[3:] == [
+        "groupadd --gid 1025 group",
+        "groupadd --gid 1026 user",
+        "useradd --uid 1025 --gid 1026 user",
+        "usermod -a -G group user",
+    ]
+    onefs.primary_group_of_user.assert_not_called()
+    onefs.gid_of_group.assert_called_once_with(group_name="user", zone="notSystem")
@@ -1,20 +1,13 @@
 """Verify the functionality of isilon_hadoop_tools.onefs."""
 
 
+import importlib
 import socket
 
 from unittest.mock import Mock
 from urllib.parse import urlparse
 import uuid
 
-import isi_sdk_7_2
-import isi_sdk_8_0
-import isi_sdk_8_0_1
-import isi_sdk_8_1_0
-import isi_sdk_8_1_1
-import isi_sdk_8_2_0
-import isi_sdk_8_2_1
-import isi_sdk_8_2_2
 import pytest
 
 from isilon_hadoop_tools import IsilonHadoopToolError, onefs
@@ -58,27 +51,41 @@ def test_api_error_str(api_error):
     assert isinstance(str(api_error), str)
 
 
+def test_api_error_errors_decoded_once():
+    """Verify that APIError decodes the exception body only once."""
+    api_exception = Mock(
+        body='{"errors": [{"message": "Group \'hadoop\' already exists"}]}'
+    )
+    api_error = onefs.APIError(api_exception)
+    assert api_error.group_already_exists_error("hadoop")
+    api_exception.body = None
+    assert not api_error.user_already_exists_error("hadoop")
+    assert api_error.errors() == [{"message": "Group 'hadoop' already exists"}]
+
+
 @pytest.mark.parametrize(
-    "revision, expected_sdk",
+    "revision, expected_sdk_name",
     [
-        (0, isi_sdk_8_2_2),
-        (onefs.ONEFS_RELEASES["7.2.0.0"], isi_sdk_7_2),
-        (onefs.ONEFS_RELEASES["8.0.0.0"], isi_sdk_8_0),
-        (onefs.ONEFS_RELEASES["8.0.0.4"], isi_sdk_8_0),
-        (onefs.ONEFS_RELEASES["8.0.1.0"], isi_sdk_8_0_1),
-        (onefs.ONEFS_RELEASES["8.0.1.1"], isi_sdk_8_0_1),
-        (onefs.ONEFS_RELEASES["8.1.0.0"], isi_sdk_8_1_0),
-        (onefs.ONEFS_RELEASES["8.1.1.0"], isi_sdk_8_1_1),
-        (onefs.ONEFS_RELEASES["8.1.2.0"], isi_sdk_8_1_1),
-        (onefs.ONEFS_RELEASES["8.2.0.0"], isi_sdk_8_2_0),
-        (onefs.ONEFS_RELEASES["8.2.1.0"], isi_sdk_8_2_1),
-        (onefs.ONEFS_RELEASES["8.2.2.0"], isi_sdk_8_2_2),
-        (onefs.ONEFS_RELEASES["8.2.3.0"], isi_sdk_8_2_2),
-        (float("inf"), isi_sdk_8_2_2),
+        (0, "isi_sdk_8_2_2"),
+        (onefs.ONEFS_RELEASES["7.2.0.0"], "isi_sdk_7_2"),
+        (onefs.ONEFS_RELEASES["8.0.0.0"], "isi_sdk_8_0"),
+        (onefs.ONEFS_RELEASES["8.0.0.4"], "isi_sdk_8_0"),
+        (onefs.ONEFS_RELEASES["8.0.1.0"], "isi_sdk_8_0_1"),
+        (onefs.ONEFS_RELEASES["8.0.1.1"], "isi_sdk_8_0_1"),
+        (onefs.ONEFS_RELEASES["8.1.0.0"], "isi_sdk_8_1_0"),
+        (onefs.ONEFS_RELEASES["8.1.1.0"], "isi_sdk_8_1_1"),
+        (onefs.ONEFS_RELEASES["8.1.2.0"], "isi_sdk_8_1_1"),
+        (onefs.ONEFS_RELEASES["8.2.0.0"], "isi_sdk_8_2_0"),
+        (onefs.ONEFS_RELEASES["8.2.1.0"], "isi_sdk_8_2_1"),
+        (onefs.ONEFS_RELEASES["8.2.2.0"], "isi_sdk_8_2_2"),
+        (onefs.ONEFS_RELEASES["8.2.3.0"], "isi_sdk_8_2_2"),
+        (float("inf"), "isi_sdk_8_2_2"),
     ],
 )
-def test_sdk_for_revision(revision, expected_sdk):
+def test_sdk_for_revision(revision, expected_sdk_name):
     """Verify that an appropriate SDK is selected for a given revision."""
+    # Each SDK is a large generated package, so only import the one this case expects.
+    expected_sdk = importlib.import_module(expected_sdk_name)
     assert onefs.sdk_for_revision(revision) is expected_sdk
 
 
@@ -88,6 +95,43 @@ def test_sdk_for_revision_unsupported():
         onefs.sdk_for_revision(revision=0, strict=True)
 
 
+def test_uid_of_user_cached(mock_sdk_client):
+    """Verify that UIDs are looked up once and forgotten when they may be stale."""
+    get_auth_user = mock_sdk_client._sdk.AuthApi.return_value.get_auth_user
+    get_auth_user.return_value = Mock(users=[Mock(uid=Mock(id="UID:2001"))])
+    assert mock_sdk_client.uid_of_user("alice") == 2001
+    assert mock_sdk_client.uid_of_user("alice") == 2001
+    assert get_auth_user.call_count == 1
+    mock_sdk_client.delete_user(name="UID:2001")
+    assert mock_sdk_client.uid_of_user("alice") == 2001
+    assert get_auth_user.call_count == 2
+    mock_sdk_client.flush_auth_cache()
+    assert mock_sdk_client.uid_of_user("alice") == 2001
+    assert get_auth_user.call_count == 3
+    mock_sdk_client.clear_name_cache()
+    assert mock_sdk_client.uid_of_user("alice") == 2001
+    assert get_auth_user.call_count == 4
+
+
+def test_gid_of_group_cached(mock_sdk_client):
+    """Verify that GIDs are looked up once and forgotten when they may be stale."""
+    get_auth_group = mock_sdk_client._sdk.AuthApi.return_value.get_auth_group
+    get_auth_group.return_value = Mock(groups=[Mock(gid=Mock(id="GID:2001"))])
+    mock_sdk_client.create_group(name="hadoop", gid=2001)
+    assert mock_sdk_client.gid_of_group("hadoop") == 2001
+    assert get_auth_group.call_count == 0
+    mock_sdk_client.delete_group(name="GID:2001")
+    assert mock_sdk_client.gid_of_group("hadoop") == 2001
+    assert mock_sdk_client.gid_of_group("hadoop") == 2001
+    assert get_auth_group.call_count == 1
+    mock_sdk_client.flush_auth_cache()
+    assert mock_sdk_client.gid_of_group("hadoop") == 2001
+    assert get_auth_group.call_count == 2
+    mock_sdk_client.clear_name_cache()
+    assert mock_sdk_client.gid_of_group("hadoop") == 2001
+    assert get_auth_group.call_count == 3
+
+
 def test_accesses_onefs_connection_error(max_retry_exception_mock, onefs_client):
     """Verify that MaxRetryErrors are converted to OneFSConnectionErrors."""
     with pytest.raises(onefs.OneFSConnectionError):
@@ -100,12 +144,25 @@ def test_accesses_onefs_api_error(empty_api_exception_mock, onefs_client):
         onefs.accesses_onefs(empty_api_exception_mock)(onefs_client)
 
 
-def test_accesses_onefs_try_again(retriable_api_exception_mock, onefs_client):
+def test_accesses_onefs_try_again(
+    retriable_api_exception_mock, onefs_client, monkeypatch
+):
     """Verify that APIExceptions are retried appropriately."""
+    monkeypatch.setattr(onefs.time, "sleep", lambda _: None)
     mock, return_value = retriable_api_exception_mock
     assert onefs.accesses_onefs(mock)(onefs_client) == return_value
 
 
+def test_accesses_onefs_try_again_exhausted(
+    unavailable_api_exception_mock, onefs_client, monkeypatch
+):
+    """Verify that retries give up after RETRY_MAX_ATTEMPTS."""
+    monkeypatch.setattr(onefs.time, "sleep", lambda _: None)
+    with pytest.raises(onefs.APIError):
+        onefs.accesses_onefs(unavailable_api_exception_mock)(onefs_client)
+    assert unavailable_api_exception_mock.call_count == onefs.RETRY_MAX_ATTEMPTS
+
+
 def test_accesses_onefs_other(exception, onefs_client):
     """Verify that arbitrary exceptions are not caught."""
     with pytest.raises(exception):
@@ -146,15 +203,15 @@ def test_delete_group(onefs_client, deletable_group):
     assert onefs_client.delete_group(name=group_name) is None
 
 
-def test_gid_of_group(onefs_client, created_group):
+def test_gid_of_group(onefs_client, created_group_module):
     """Verify that the correct GID is fetched for an existing group."""
-    group_name, gid = created_group
+    group_name, gid = created_group_module
     assert onefs_client.gid_of_group(group_name=group_name) == gid
 
 
-def test_groups(onefs_client, created_group):
+def test_groups(onefs_client, created_group_module):
     """Verify that a group that is known to exist appears in the list of existing groups."""
-    group_name, _ = created_group
+    group_name, _ = created_group_module
     assert group_name in onefs_client.groups()
 
 
@@ -189,15 +246,15 @@ def test_delete_proxy_user(onefs_client, deletable_proxy_user):
     assert onefs_client.delete_hdfs_proxy_user(name=deletable_proxy_user[0]) is None
 
 
-def test_uid_of_user(onefs_client, created_user):
+def test_uid_of_user(onefs_client, created_user_module):
     """Verify that the correct UID is fetched for an existing user."""
-    user_name, _, uid = created_user
+    user_name, _, uid = created_user_module
     assert onefs_client.uid_of_user(user_name=user_name) == uid
 
 
-def test_primary_group_of_user(onefs_client, created_user):
+def test_primary_group_of_user(onefs_client, created_user_module):
     """Verify that the correct primary group is fetched for an existing user."""
-    user_name, primary_group, _ = created_user
+    user_name, primary_group, _ = created_user_module
     assert onefs_client.primary_group_of_user(user_name=user_name) == primary_group
 
 
@@ -227,6 +284,12 @@ def test_delete_spn(onefs_client, deletable_spn):
     onefs_client.delete_spn(spn=spn, provider=provider)
 
 
+def test_delete_spns(onefs_client, deletable_spns):
+    """Verify that several SPNs can be deleted in one call successfully."""
+    spns, provider = deletable_spns
+    onefs_client.delete_spns(spns=spns, provider=provider)
+
+
 def test_create_spn(request):
     """Verify that a Kerberos SPN can be created successfully."""
     request.getfixturevalue("created_spn")
@@ -297,10 +360,10 @@ def test_hdfs_inotify_settings(onefs_client):
         "zone_id": int,
     }.items(),
 )
-def test_zone_settings(onefs_client, setting_and_type):
+def test_zone_settings(zone_settings, setting_and_type):
     """Ensure zone_settings returns all available settings appropriately."""
     setting, setting_type = setting_and_type
-    assert isinstance(onefs_client.zone_settings()[setting], setting_type)
+    assert isinstance(zone_settings[setting], setting_type)
 
 
 def test_zone_settings_bad_zone(onefs_client):
@@ -350,21 +413,38 @@ def test_chmod(onefs_client, created_directory, max_mode, request):
     request.addfinalizer(_check_postconditions)
 
 
+def test_chown_mode(
+    onefs_client, created_directory, created_user_module, max_mode, request
+):
+    """Check that chown can modify ownership and the mode in one call."""
+    path, permissions = created_directory
+    user_name = created_user_module[0]
+    new_mode = (permissions["mode"] + 1) % (max_mode + 1)
+    assert onefs_client.chown(path, owner=user_name, mode=new_mode) is None
+
+    def _check_postconditions():
+        new_permissions = onefs_client.permissions(path)
+        assert new_permissions["owner"] == user_name
+        assert new_permissions["mode"] == new_mode
+
+    request.addfinalizer(_check_postconditions)
+
+
 @pytest.mark.parametrize("new_owner", [True, False])
 @pytest.mark.parametrize("new_group", [True, False])
 def test_chown(
     onefs_client,
     created_directory,
-    created_user,
-    created_group,
+    created_user_module,
+    created_group_module,
     new_owner,
     new_group,
     request,
 ):
     """Check that chown modifies ownership correctly."""
     path, permissions = created_directory
-    user_name = created_user[0]
-    group_name = created_group[0]
+    user_name = created_user_module[0]
+    group_name = created_group_module[0]
     assert (
         onefs_client.chown(
             path,
@@ -375,10 +455,11 @@ def test_chown(
     )
 
     def _check_postconditions():
+        new_permissions = onefs_client.permissions(path)
         owner = user_name if new_owner else permissions["owner"]
-        assert onefs_client.permissions(path)["owner"] == owner
+        assert new_permissions["owner"] == owner
         group = group_name if new_group else permissions["group"]
-        assert onefs_client.permissions(path)["group"] == group
+        assert new_permissions["group"] == group
 
     request.addfinalizer(_check_postconditions)
 
@@ -391,6 +472,20 @@ def test_feature_supported(onefs_client, supported_feature):
         assert onefs_client.revision() < onefs.ONEFS_RELEASES["8.2.0.0"]
 
 
+def test_feature_is_supported_refresh(mock_sdk_client, supported_feature, monkeypatch):
+    """Verify that committed features are read once, and again after refresh."""
+    upgrade_cluster = Mock(
+        return_value=Mock(committed_features=Mock(gen_bits=[], default_gen=0))
+    )
+    monkeypatch.setattr(mock_sdk_client, "_upgrade_cluster", upgrade_cluster)
+    assert mock_sdk_client.feature_is_supported(supported_feature)
+    assert mock_sdk_client.feature_is_supported(supported_feature)
+    assert upgrade_cluster.call_count == 1
+    mock_sdk_client.refresh()
+    assert mock_sdk_client.feature_is_supported(supported_feature)
+    assert upgrade_cluster.call_count == 2
+
+
 def test_feature_unsupported(onefs_client, unsupported_feature):
     """Ensure that feature_is_supported correctly identifies an unsupported feature."""
     try: